@@ -3,6 +3,7 @@
 import json
 import os
 import re
+import stat
 import subprocess
 from datetime import datetime
 from pathlib import Path
@@ -19,6 +20,32 @@ try:
 except ImportError:
     from error_logger import log_error, log_subprocess_error
 
+# YAML frontmatter block between --- delimiters at the start of a note
+_FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---", re.DOTALL)
+
+# Extensions of cached media files
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm")
+MEDIA_EXTENSIONS = VIDEO_EXTENSIONS + (".mp3", ".m4a", ".opus")
+
+# Sidecar files deleted along with a cached media file
+AUXILIARY_EXTENSIONS = (
+    ".srt",
+    ".nfo",
+    ".description",
+    ".json",
+    ".info.json",
+    ".en.srt",
+    ".en.vtt",
+)
+
+
+def _is_regular_file(path):
+    """Check that path is an existing regular file with a single stat call."""
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except OSError:
+        return False
+
 
 def create_show_nfo(channel_name, channel_id=None):
     """Create an NFO file for a YouTube channel (show) in the Kodi NFO format."""
@@ -201,10 +228,15 @@ def extract_frontmatter(file_path):
     """Extract the YAML frontmatter from a markdown file."""
     try:
         with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+            # Frontmatter sits at the top, only read the rest if it's longer
+            content = f.read(8192)
+            if not content.startswith("---\n"):
+                return None
+            if content.count("---") < 2:
+                content += f.read()
 
         # Extract YAML frontmatter between --- delimiters
-        frontmatter_match = re.search(r"^---\n(.*?)\n---", content, re.DOTALL)
+        frontmatter_match = _FRONTMATTER_RE.search(content)
         if frontmatter_match:
             yaml_text = frontmatter_match.group(1)
             frontmatter = yaml.safe_load(yaml_text)
@@ -222,21 +254,12 @@ def get_youtube_cached_ids():
         return []
 
     video_ids = set()
-    # Look for videos recursively in all subdirectories
-    for ext in [".mp4", ".mkv", ".webm"]:
-        # Look in root directory first
-        for file_path in YOUTUBE_CACHE_DIR.glob(f"*{ext}"):
-            if file_path.is_file():
-                # Extract the video ID from the filename (remove extension)
-                video_id = file_path.stem
-                video_ids.add(video_id)
-
-        # Then look in all subdirectories
-        for file_path in YOUTUBE_CACHE_DIR.glob(f"**/*{ext}"):
-            if file_path.is_file() and file_path.parent != YOUTUBE_CACHE_DIR:
+    # Walk the tree once; videos live in the root or in show/season folders
+    for dirpath, dirnames, filenames in os.walk(YOUTUBE_CACHE_DIR):
+        for filename in filenames:
+            if filename.endswith(VIDEO_EXTENSIONS):
                 # Extract the video ID from the filename (remove extension)
-                video_id = file_path.stem
-                video_ids.add(video_id)
+                video_ids.add(os.path.splitext(filename)[0])
 
     return video_ids
 
@@ -420,20 +443,13 @@ def delete_cached_file(file_id, cache_dir):
     try:
         deleted_any = False
 
-        # First, check if the video is in the hierarchical structure
-        # It could be in a subfolder like CHANNEL_NAME/YEAR/ID.mp4
-        all_media_files = []
-
-        # First, search recursively for the file in all subdirectories
-        for extension in [".mp4", ".mkv", ".webm", ".mp3", ".m4a", ".opus"]:
-            # Search both direct files and in subdirectories
-            direct_path = cache_dir / f"{file_id}{extension}"
-            if direct_path.exists():
-                all_media_files.append(direct_path)
-
-            # Search in subdirectories
-            for file_path in cache_dir.glob(f"**/{file_id}{extension}"):
-                all_media_files.append(file_path)
+        # One recursive search covers both the root and the hierarchical
+        # structure (a subfolder like CHANNEL_NAME/YEAR/ID.mp4)
+        all_media_files = [
+            file_path
+            for file_path in cache_dir.rglob(f"{file_id}.*")
+            if file_path.suffix.lower() in MEDIA_EXTENSIONS
+        ]
 
         if not all_media_files:
             print(f"No media files found for {file_id}")
@@ -452,26 +468,11 @@ def delete_cached_file(file_id, cache_dir):
             # Delete associated auxiliary files in the same directory
             for aux_path in parent_dir.glob(f"{file_id}.*"):
                 # Skip actual media files (already deleted the main one)
-                if aux_path.suffix.lower() in [
-                    ".mp4",
-                    ".mkv",
-                    ".webm",
-                    ".mp3",
-                    ".m4a",
-                    ".opus",
-                ]:
+                if aux_path.suffix.lower() in MEDIA_EXTENSIONS:
                     continue
 
                 # Only delete specific auxiliary file types
-                if aux_path.suffix.lower() in [
-                    ".srt",
-                    ".nfo",
-                    ".description",
-                    ".json",
-                    ".info.json",
-                    ".en.srt",
-                    ".en.vtt",
-                ]:
+                if aux_path.suffix.lower() in AUXILIARY_EXTENSIONS:
                     print(f"Deleting auxiliary file: {aux_path}")
                     aux_path.unlink()
                     deleted_any = True
@@ -586,13 +587,12 @@ def cache_single_youtube_video(file_path):
         create_show_nfo(safe_channel, channel_id)
         
         # Check for existing video files
-        video_extensions = [".mp4", ".mkv", ".webm"]
         found_video = False
         video_path = None
         
-        for ext in video_extensions:
+        for ext in VIDEO_EXTENSIONS:
             potential_path = season_dir / f"{video_id}{ext}"
-            if potential_path.exists():
+            if _is_regular_file(potential_path):
                 found_video = True
                 video_path = potential_path
                 break
@@ -601,7 +601,7 @@ def cache_single_youtube_video(file_path):
             print(f"Video already cached: {video_path}")
             # Check if NFO exists, create if not
             nfo_path = season_dir / f"{video_id}.nfo"
-            if not nfo_path.exists():
+            if not _is_regular_file(nfo_path):
                 print("Creating NFO file...")
                 create_nfo_file(video_id, video_info, create_new_structure=True)
             return True
@@ -676,6 +676,9 @@ def manage_youtube_cache(video_id=None):
             print(f"Deleting {vid} - not marked for caching")
             delete_youtube_video(vid)
 
+    # Index existing NFO files once instead of walking the cache tree per video
+    nfo_ids = {nfo_path.stem for nfo_path in YOUTUBE_CACHE_DIR.glob("**/*.nfo")}
+
     # Download videos that should be cached but aren't
     for vid, cache in should_cache.items():
         if cache and vid not in cached_ids:
@@ -683,14 +686,7 @@ def manage_youtube_cache(video_id=None):
             download_youtube_video(vid)
         elif cache and vid in cached_ids:
             # Video exists and should be cached, check if NFO exists
-            found_nfo = False
-
-            # Look in all possible locations for an NFO file
-            for potential_nfo in YOUTUBE_CACHE_DIR.glob(f"**/{vid}.nfo"):
-                found_nfo = True
-                break
-
-            if not found_nfo:
+            if vid not in nfo_ids:
                 print(f"Creating NFO file for existing video: {vid}")
                 try:
                     json_cmd = [
@@ -758,7 +754,7 @@ def convert_flat_structure_to_hierarchical():
     print(f"Total files in directory: {len(all_files)}")
 
     # Find media files with specific extensions
-    for ext in [".mp4", ".mkv", ".webm"]:
+    for ext in VIDEO_EXTENSIONS:
         matching_files = list(YOUTUBE_CACHE_DIR.glob(f"*{ext}"))
         print(f"Found {len(matching_files)} files with extension {ext}")
         video_files.extend(matching_files)
@@ -1033,7 +1029,7 @@ def regenerate_youtube_nfo_files():
 
     # Get all video files recursively (.mp4, .mkv, etc.)
     video_files = []
-    for ext in [".mp4", ".mkv", ".webm"]:
+    for ext in VIDEO_EXTENSIONS:
         video_files.extend(list(YOUTUBE_CACHE_DIR.glob(f"**/*{ext}")))
 
     print(f"Found {len(video_files)} video files in cache directory")
@@ -8,7 +8,10 @@ import yaml
 import uuid
 from pathlib import Path
 
-from .paths import TOPIC_LANG_DIR
+try:
+    from capturemd.paths import TOPIC_LANG_DIR
+except ImportError:
+    from paths import TOPIC_LANG_DIR
 
 def get_repo_info(repo_id):
     """Get information about a GitHub repository."""
@@ -1,9 +1,46 @@
 #!/usr/bin/env python3
 # capture_steam.py
 
+import re
 import requests
 import json
-from datetime import datetime
+from datetime import date, datetime
+
+# Steam release dates come as "15 Mar, 2024", "Mar 15, 2024" or "March 15, 2024"
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10,
+    "november": 11, "december": 12,
+}
+_DATE_RE = re.compile(
+    r"^(\d{1,2})\s+([A-Za-z]+),?\s+(\d{4})$|^([A-Za-z]+)\s+(\d{1,2}),?\s+(\d{4})$"
+)
+
+
+def _parse_release_date(date_str):
+    """Parse a Steam release date to YYYY-MM-DD without going through strptime.
+
+    Returns None if the string doesn't match one of the known shapes.
+    """
+    match = _DATE_RE.match(date_str.strip())
+    if not match:
+        return None
+
+    if match.group(1):
+        day, month_name, year = match.group(1), match.group(2), match.group(3)
+    else:
+        month_name, day, year = match.group(4), match.group(5), match.group(6)
+
+    month = _MONTHS.get(month_name.lower())
+    if not month:
+        return None
+
+    try:
+        return date(int(year), month, int(day)).isoformat()
+    except ValueError:
+        return None
 
 def get_steam_game_info(app_id):
     """Get information about a Steam game using the Steam API."""
@@ -85,13 +122,15 @@ def parse_note(frontmatter):
     if 'release_date' in game_info and 'date' in game_info['release_date']:
         date_str = game_info['release_date']['date']
         try:
-            # Try to parse the date in multiple formats
-            for fmt in ["%d %b, %Y", "%b %d, %Y", "%B %d, %Y"]:
-                try:
-                    release_date = datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
-                    break
-                except ValueError:
-                    continue
+            release_date = _parse_release_date(date_str)
+            if release_date is None:
+                # Fall back to strptime for anything the fast path doesn't know
+                for fmt in ["%d %b, %Y", "%b %d, %Y", "%B %d, %Y"]:
+                    try:
+                        release_date = datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+                        break
+                    except ValueError:
+                        continue
         except Exception as e:
             print(f"Error parsing release date '{date_str}': {e}")
     
@@ -14,7 +14,7 @@ from capturemd.url_processor import (
     get_steam_game_info, get_hackernews_item_info,
     process_url
 )
-from capturemd.paths import BOOKMARK_NOTES_DIR
+from capturemd.paths import BOOKMARK_NOTES_DIR, CACHE_DIR
 
 # Wallabag API constants - loaded from environment variables
 WALLABAG_HOST = os.getenv("WALLABAG_HOST", "")
@@ -24,6 +24,12 @@ WALLABAG_USERNAME = os.getenv("WALLABAG_USERNAME", "")
 WALLABAG_PASSWORD = os.getenv("WALLABAG_PASSWORD", "")
 WALLABAG_PARSED_TAG = "parsed"
 
+# YAML frontmatter block between --- delimiters at the start of a note
+_FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---', re.DOTALL)
+
+# Last seen entry update time, used to only fetch entries changed since then
+WALLABAG_SINCE_FILE = CACHE_DIR / "wallabag_since"
+
 
 class WallabagAPI:
     """Client for interacting with the Wallabag API."""
@@ -66,8 +72,13 @@ class WallabagAPI:
             "Content-Type": "application/json"
         }
     
-    def get_entries(self, page: int = 1, tags: List[str] = None) -> Dict:
-        """Get entries from Wallabag, optionally filtered by tags."""
+    def get_entries(self, page: int = 1, tags: List[str] = None,
+                    since: Optional[int] = None) -> Optional[Dict]:
+        """Get entries from Wallabag, optionally filtered by tags and update time.
+        
+        Returns:
+            Optional[Dict]: The page of entries, or None if the request failed
+        """
         entries_url = f"{self.host}/api/entries"
         params = {"page": page, "perPage": 30}
         
@@ -75,6 +86,10 @@ class WallabagAPI:
         if tags:
             params["tags"] = ",".join(tags)
         
+        # Only return entries updated after this unix timestamp
+        if since:
+            params["since"] = since
+        
         try:
             response = requests.get(
                 entries_url, 
@@ -85,15 +100,24 @@ class WallabagAPI:
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"Error getting entries: {e}")
-            return {"_embedded": {"items": []}}
+            return None
     
-    def get_entries_without_tag(self, tag: str) -> List[Dict]:
-        """Get all entries that do not have a specific tag."""
+    def get_entries_without_tag(self, tag: str,
+                                since: Optional[int] = None) -> Tuple[List[Dict], bool]:
+        """Get all entries that do not have a specific tag.
+        
+        Returns:
+            Tuple[List[Dict], bool]: The entries, and False if a page failed
+            to load, in which case the entries are incomplete
+        """
         all_entries = []
         page = 1
         
         while True:
-            result = self.get_entries(page=page)
+            result = self.get_entries(page=page, since=since)
+            if result is None:
+                return all_entries, False
+            
             items = result.get("_embedded", {}).get("items", [])
             
             if not items:
@@ -101,8 +125,8 @@ class WallabagAPI:
                 
             # Filter out entries that have the tag
             filtered_entries = [
-                entry for entry in items 
-                if not any(t.get("label") == tag for t in entry.get("tags", []))
+                entry for entry in items
+                if tag not in {t.get("label") for t in entry.get("tags", ())}
             ]
             
             all_entries.extend(filtered_entries)
@@ -112,7 +136,7 @@ class WallabagAPI:
             if not result.get("_links", {}).get("next"):
                 break
                 
-        return all_entries
+        return all_entries, True
     
     def delete_entry(self, entry_id: int) -> bool:
         """Delete an entry from Wallabag."""
@@ -186,6 +210,34 @@ class WallabagAPI:
             return False, None
 
 
+def load_wallabag_since() -> Optional[int]:
+    """Load the last seen entry update timestamp, if any."""
+    try:
+        return int(WALLABAG_SINCE_FILE.read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        return None
+
+
+def save_wallabag_since(timestamp: int) -> None:
+    """Persist the last seen entry update timestamp."""
+    try:
+        WALLABAG_SINCE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        WALLABAG_SINCE_FILE.write_text(str(timestamp), encoding="utf-8")
+    except OSError as e:
+        print(f"Error saving Wallabag since timestamp: {e}")
+
+
+def get_entry_timestamp(entry: Dict) -> Optional[int]:
+    """Convert an entry's updated_at (e.g. 2024-03-15T10:00:00+0100) to a unix timestamp."""
+    updated_at = entry.get("updated_at")
+    if not updated_at:
+        return None
+    try:
+        return int(datetime.strptime(updated_at, "%Y-%m-%dT%H:%M:%S%z").timestamp())
+    except ValueError:
+        return None
+
+
 def identify_url_type(url: str) -> str:
     """Identify the type of URL based on existing patterns."""
     if is_youtube_video(url):
@@ -204,15 +256,19 @@ def identify_url_type(url: str) -> str:
         return "default"
 
 
-def process_wallabag_entry(wallabag: WallabagAPI, entry: Dict) -> None:
-    """Process a single Wallabag entry."""
+def process_wallabag_entry(wallabag: WallabagAPI, entry: Dict) -> bool:
+    """Process a single Wallabag entry.
+    
+    Returns:
+        bool: False if the entry could not be turned into a note
+    """
     entry_id = entry.get("id")
     url = entry.get("url")
     title = entry.get("title", "")
     
     if not url:
         print(f"Entry {entry_id} has no URL, skipping")
-        return
+        return True
     
     print(f"Processing entry: {title} ({url})")
     
@@ -225,7 +281,7 @@ def process_wallabag_entry(wallabag: WallabagAPI, entry: Dict) -> None:
     
     if not note_path:
         print(f"Failed to process URL: {url}")
-        return
+        return False
     
     # If it's a default bookmark, update the note with Wallabag information
     # (but only if it's a newly created note, not an existing one)
@@ -248,6 +304,8 @@ def process_wallabag_entry(wallabag: WallabagAPI, entry: Dict) -> None:
             print(f"Deleted entry {entry_id} from Wallabag")
         else:
             print(f"Failed to delete entry {entry_id} from Wallabag")
+    
+    return True
 
 
 def update_note_with_wallabag_info(note_path: str, entry: Dict) -> None:
@@ -261,7 +319,7 @@ def update_note_with_wallabag_info(note_path: str, entry: Dict) -> None:
         note_content = f.read()
     
     # Extract YAML frontmatter between --- delimiters
-    frontmatter_match = re.search(r'^---\n(.*?)\n---', note_content, re.DOTALL)
+    frontmatter_match = _FRONTMATTER_RE.search(note_content)
     if not frontmatter_match:
         print(f"No frontmatter found in {note_path}")
         return
@@ -308,7 +366,7 @@ def find_unparsed_bookmark_notes() -> List[str]:
                 note_content = f.read()
             
             # Extract YAML frontmatter between --- delimiters
-            frontmatter_match = re.search(r'^---\n(.*?)\n---', note_content, re.DOTALL)
+            frontmatter_match = _FRONTMATTER_RE.search(note_content)
             if not frontmatter_match:
                 continue
                 
@@ -335,7 +393,7 @@ def process_existing_bookmark_notes(wallabag: WallabagAPI) -> None:
             note_content = f.read()
         
         # Extract YAML frontmatter between --- delimiters
-        frontmatter_match = re.search(r'^---\n(.*?)\n---', note_content, re.DOTALL)
+        frontmatter_match = _FRONTMATTER_RE.search(note_content)
         if not frontmatter_match:
             print(f"No frontmatter found in {note_path}")
             continue
@@ -409,9 +467,11 @@ def process_wallabag() -> int:
     
     print("Authenticated with Wallabag API")
     
-    # Get all entries without the "parsed" tag
+    # Get all entries without the "parsed" tag, skipping anything not
+    # updated since the last fully successful run
+    since = load_wallabag_since()
     print(f"Fetching entries without the '{WALLABAG_PARSED_TAG}' tag")
-    entries = wallabag.get_entries_without_tag(WALLABAG_PARSED_TAG)
+    entries, complete = wallabag.get_entries_without_tag(WALLABAG_PARSED_TAG, since=since)
     
     if not entries:
         print("No unparsed entries found in Wallabag")
@@ -419,8 +479,16 @@ def process_wallabag() -> int:
         print(f"Found {len(entries)} unparsed entries")
         
         # Process each entry
+        all_processed = True
         for entry in entries:
-            process_wallabag_entry(wallabag, entry)
+            if not process_wallabag_entry(wallabag, entry):
+                all_processed = False
+        
+        # Only move the window forward when every page was fetched and nothing
+        # failed, so missed and failed entries are fetched again on the next run
+        timestamps = [ts for ts in map(get_entry_timestamp, entries) if ts]
+        if complete and all_processed and timestamps:
+            save_wallabag_since(max(timestamps))
     
     # Process existing bookmark notes
     print("Processing existing bookmark notes")
@@ -1,35 +1,203 @@
 #!/usr/bin/env python3
 # capture_youtube_videos.py
 
-import subprocess
 import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
 from datetime import datetime
 
-def get_video_info(video_id):
-    """Get information about a YouTube video using yt-dlp."""
+try:
+    from yt_dlp import YoutubeDL
+except ImportError:
+    YoutubeDL = None
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    from capturemd.paths import CACHE_DIR
+except ImportError:
+    from paths import CACHE_DIR
+
+# On-disk cache of yt-dlp video info, one JSON file per video ID
+YT_META_CACHE_DIR = CACHE_DIR / "yt_meta"
+YT_META_CACHE_TTL = 7 * 24 * 60 * 60
+
+# The only video info fields parse_note uses
+VIDEO_INFO_FIELDS = (
+    'id', 'title', 'thumbnail', 'channel', 'uploader', 'channel_id',
+    'upload_date', 'duration',
+)
+
+# Resolved once instead of searching $PATH on every run
+YTDLP_PATH = shutil.which('yt-dlp') or 'yt-dlp'
+
+# Video info fetched ahead of time by prefetch(), keyed by video ID
+_prefetched_info = {}
+
+# Shared YoutubeDL instance, created on first use. Notes may be parsed from
+# several threads, so extraction through it is serialized.
+_ydl = None
+_ydl_lock = threading.Lock()
+
+
+def _get_ydl():
+    """Return the shared in-process YoutubeDL instance.
+    
+    Configured like the yt-dlp CLI fallback in _fetch_video_infos: only
+    metadata is needed, so formats aren't probed and the DASH/HLS manifests
+    they would be selected from aren't downloaded.
+    """
+    global _ydl
+    if _ydl is None:
+        _ydl = YoutubeDL({
+            'quiet': True,
+            'no_warnings': True,
+            'skip_download': True,
+            'noplaylist': True,
+            'check_formats': False,
+            'extractor_args': {'youtube': {'skip': ['dash', 'hls']}},
+        })
+    return _ydl
+
+def _get_video_infos_in_process(video_ids):
+    """Get video information through the yt_dlp library, without a subprocess."""
+    video_infos = {}
+    for video_id in video_ids:
+        try:
+            with _ydl_lock:
+                ydl = _get_ydl()
+                info = ydl.extract_info(f'https://www.youtube.com/watch?v={video_id}', download=False)
+                # Same JSON-safe fields the CLI path prints
+                info = ydl.sanitize_info(info)
+        except Exception as e:
+            print(f"Error getting info for video {video_id}: {e}")
+            continue
+        video_infos[video_id] = {
+            field: info[field] for field in VIDEO_INFO_FIELDS if field in info
+        }
+    
+    return video_infos
+
+def _read_cached_info(video_id):
+    """Return cached video info if present and younger than the TTL."""
+    cache_path = YT_META_CACHE_DIR / f"{video_id}.json"
     try:
-        # Run yt-dlp as a subprocess to get video information
+        if time.time() - cache_path.stat().st_mtime >= YT_META_CACHE_TTL:
+            return None
+        return json_loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+def _write_cached_info(video_id, video_info):
+    """Atomically write video info to the on-disk cache."""
+    try:
+        YT_META_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=YT_META_CACHE_DIR, suffix=".tmp", delete=False
+        ) as f:
+            json.dump(video_info, f)
+        os.replace(f.name, YT_META_CACHE_DIR / f"{video_id}.json")
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Error caching info for video {video_id}: {e}")
+
+def get_video_infos(video_ids):
+    """Get information about several YouTube videos.
+    
+    Cached info is reused unless CAPTUREMD_YT_META_CACHE is "off" (no cache)
+    or "refresh" (always fetch, then update the cache).
+    
+    Returns:
+        dict: Video info keyed by video ID. Videos yt-dlp failed on are missing.
+    """
+    cache_mode = os.getenv("CAPTUREMD_YT_META_CACHE", "on")
+    
+    video_infos = {}
+    if cache_mode == "on":
+        for video_id in video_ids:
+            video_info = _read_cached_info(video_id)
+            if video_info:
+                video_infos[video_id] = video_info
+    
+    missing_ids = [video_id for video_id in video_ids if video_id not in video_infos]
+    fetched_infos = _fetch_video_infos(missing_ids)
+    
+    if cache_mode != "off":
+        for video_id, video_info in fetched_infos.items():
+            _write_cached_info(video_id, video_info)
+    
+    video_infos.update(fetched_infos)
+    return video_infos
+
+def _fetch_video_infos(video_ids):
+    """Fetch video information with yt-dlp.
+    
+    Uses the yt_dlp library, which is an install requirement and so the path
+    taken in practice. The single yt-dlp CLI run for the whole batch is only
+    a fallback for when the library isn't importable.
+    """
+    if not video_ids:
+        return {}
+    
+    if YoutubeDL is not None:
+        return _get_video_infos_in_process(video_ids)
+    
+    try:
+        # One yt-dlp process for all videos, one JSON object per line
         cmd = [
-            'yt-dlp',
-            f'https://www.youtube.com/watch?v={video_id}',
-            '--dump-json',
-            '--no-playlist'
+            YTDLP_PATH,
+            *[f'https://www.youtube.com/watch?v={video_id}' for video_id in video_ids],
+            '--no-playlist',
+            '--skip-download',
+            '--no-check-formats',
+            '--extractor-args', 'youtube:skip=dash,hls',
+            '--ignore-errors',
+            # Print only the fields we use instead of the whole info dict
+            '--print', f"%(.{{{','.join(VIDEO_INFO_FIELDS)}}})j"
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        video_info = json.loads(result.stdout)
-        
-        return video_info
-    except subprocess.CalledProcessError as e:
-        print(f"Error running yt-dlp: {e}")
-        print(f"stderr: {e.stderr}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing yt-dlp output: {e}")
-        return None
+        # Keep stdout as bytes, the JSON parser decodes it itself
+        result = subprocess.run(cmd, capture_output=True)
+        if result.returncode != 0:
+            print(f"Error running yt-dlp: exit code {result.returncode}")
+            print(f"stderr: {result.stderr.decode('utf-8', errors='replace')}")
     except Exception as e:
         print(f"Unexpected error: {e}")
-        return None
+        return {}
+    
+    video_infos = {}
+    for line in result.stdout.splitlines():
+        if not line.strip():
+            continue
+        try:
+            video_info = json_loads(line)
+        except ValueError as e:
+            print(f"Error parsing yt-dlp output: {e}")
+            continue
+        video_infos[video_info.get('id')] = video_info
+    
+    return video_infos
+
+def get_video_info(video_id):
+    """Get information about a YouTube video using yt-dlp."""
+    if video_id not in _prefetched_info:
+        _prefetched_info.update(get_video_infos([video_id]))
+    
+    return _prefetched_info.get(video_id)
+
+def prefetch(frontmatters):
+    """Fetch video info for a batch of notes before they are parsed one by one."""
+    video_ids = list(dict.fromkeys(
+        frontmatter.get('locator') for frontmatter in frontmatters
+        if frontmatter.get('locator') and frontmatter.get('locator') not in _prefetched_info
+    ))
+    _prefetched_info.update(get_video_infos(video_ids))
 
 def parse_note(frontmatter):
     """Parse a YouTube video note and update its frontmatter."""
@@ -54,8 +222,11 @@ def parse_note(frontmatter):
     # Create RSS feed URL for the channel
     channel_feed = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}" if channel_id else ''
     date_str = video_info.get('upload_date', '') 
-    date_obj = datetime.strptime(date_str, "%Y%m%d")
-    upload_date = date_obj.strftime("%Y-%m-%d")
+    if len(date_str) == 8 and date_str.isdigit():
+        # Plain YYYYMMDD, reformat by slicing instead of going through strptime
+        upload_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+    else:
+        upload_date = datetime.strptime(date_str, "%Y%m%d").strftime("%Y-%m-%d")
     
     # Preserve the cache flag if it's already set to true
     cache_value = frontmatter.get('cache', True)
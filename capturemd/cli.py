@@ -2,83 +2,106 @@
 # cli.py - Command-line interface for capturemd
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
 from capturemd import __version__
-from capturemd.url_processor import parse_unparsed_notes, process_url
 
 
-def create_parser():
-    parser = argparse.ArgumentParser(
-        description="Capture web content into markdown files.", prog="capturemd"
+def _add_parse_flag(subparser):
+    subparser.add_argument(
+        "--parse", action="store_true", help="Parse the note immediately after creation"
     )
 
-    parser.add_argument(
-        "--version", action="version", version=f"capturemd {__version__}"
+
+def _add_meta_cache_flags(subparser):
+    cache_group = subparser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the cached YouTube video metadata",
+    )
+    cache_group.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Fetch fresh YouTube video metadata and update the cache",
     )
 
-    subparsers = parser.add_subparsers(dest="command", help="Command to run")
 
-    # URL parser
+def _apply_meta_cache_flags(args):
+    """Set CAPTUREMD_YT_META_CACHE from --no-cache / --refresh-cache.
+
+    Passed through the environment so a parser subprocess sees it too.
+    """
+    if getattr(args, "no_cache", False):
+        os.environ["CAPTUREMD_YT_META_CACHE"] = "off"
+    elif getattr(args, "refresh_cache", False):
+        os.environ["CAPTUREMD_YT_META_CACHE"] = "refresh"
+
+
+def _add_url_parser(subparsers):
     url_parser = subparsers.add_parser("url", help="Process a URL and create a note")
     url_parser.add_argument(
         "url",
         nargs="?",
         help="URL to process. If not provided, will try to use clipboard.",
     )
-    url_parser.add_argument(
-        "--parse", action="store_true", help="Parse the note immediately after creation"
-    )
+    _add_parse_flag(url_parser)
+    url_parser.set_defaults(handler=_run_url)
+
 
-    # YouTube parser
+def _add_youtube_parser(subparsers):
     youtube_parser = subparsers.add_parser(
         "youtube", help="Process a YouTube video URL"
     )
     youtube_parser.add_argument("url", help="YouTube video URL")
-    youtube_parser.add_argument(
-        "--parse", action="store_true", help="Parse the note immediately after creation"
-    )
+    _add_parse_flag(youtube_parser)
+    _add_meta_cache_flags(youtube_parser)
+    youtube_parser.set_defaults(handler=_run_url)
+
 
-    # GitHub parser
+def _add_github_parser(subparsers):
     github_parser = subparsers.add_parser(
         "github", help="Process a GitHub repository URL"
     )
     github_parser.add_argument("url", help="GitHub repository URL")
-    github_parser.add_argument(
-        "--parse", action="store_true", help="Parse the note immediately after creation"
-    )
+    _add_parse_flag(github_parser)
+    github_parser.set_defaults(handler=_run_url)
+
 
-    # Reddit parser
+def _add_reddit_parser(subparsers):
     reddit_parser = subparsers.add_parser("reddit", help="Process a Reddit thread URL")
     reddit_parser.add_argument("url", help="Reddit thread URL")
-    reddit_parser.add_argument(
-        "--parse", action="store_true", help="Parse the note immediately after creation"
-    )
+    _add_parse_flag(reddit_parser)
+    reddit_parser.set_defaults(handler=_run_url)
+
 
-    # Steam parser
+def _add_steam_parser(subparsers):
     steam_parser = subparsers.add_parser("steam", help="Process a Steam game URL")
     steam_parser.add_argument("url", help="Steam game URL")
-    steam_parser.add_argument(
-        "--parse", action="store_true", help="Parse the note immediately after creation"
-    )
+    _add_parse_flag(steam_parser)
+    steam_parser.set_defaults(handler=_run_url)
+
 
-    # Hacker News parser
+def _add_hackernews_parser(subparsers):
     hackernews_parser = subparsers.add_parser(
         "hackernews", help="Process a Hacker News item URL"
     )
     hackernews_parser.add_argument("url", help="Hacker News item URL")
-    hackernews_parser.add_argument(
-        "--parse", action="store_true", help="Parse the note immediately after creation"
-    )
+    _add_parse_flag(hackernews_parser)
+    hackernews_parser.set_defaults(handler=_run_url)
+
 
-    # Google search parser
+def _add_google_parser(subparsers):
     google_parser = subparsers.add_parser(
         "google", help="Process a Google search query"
     )
     google_parser.add_argument("query", help="Google search query or URL")
+    google_parser.set_defaults(handler=_run_google)
+
 
-    # Podcast parser
+def _add_podcast_parser(subparsers):
     podcast_parser = subparsers.add_parser("podcast", help="Process a podcast episode")
     podcast_parser.add_argument("url", help="Podcast episode URL")
     podcast_parser.add_argument(
@@ -98,18 +121,24 @@ def create_parser():
     podcast_parser.add_argument(
         "--tags", default="inbox", help="Comma-separated list of tags"
     )
+    podcast_parser.set_defaults(handler=_run_podcast)
 
-    # Wallabag parser
+
+def _add_wallabag_parser(subparsers):
     wallabag_parser = subparsers.add_parser(
         "parse-wallabag", help="Process entries from Wallabag"
     )
+    wallabag_parser.set_defaults(handler=_run_wallabag)
+
 
-    # FreshRSS parser
+def _add_freshrss_parser(subparsers):
     freshrss_parser = subparsers.add_parser(
         "parse-rss", help="Process starred items from FreshRSS"
     )
+    freshrss_parser.set_defaults(handler=_run_freshrss)
+
 
-    # Parse command
+def _add_parse_parser(subparsers):
     parse_parser = subparsers.add_parser("parse", help="Parse unparsed notes")
     parse_parser.add_argument(
         "file",
@@ -117,9 +146,13 @@ def create_parser():
         default=None,
         help="Optional file path to parse a specific note",
     )
+    _add_meta_cache_flags(parse_parser)
+    parse_parser.set_defaults(handler=_run_parse)
 
-    # Cache command
+
+def _add_cache_parser(subparsers):
     cache_parser = subparsers.add_parser("cache", help="Manage cached content")
+    cache_parser.set_defaults(handler=_run_cache)
     cache_subparsers = cache_parser.add_subparsers(
         dest="cache_type", help="Type of content to cache"
     )
@@ -146,129 +179,179 @@ def create_parser():
     )
 
     # Podcast cache subcommand
-    podcast_cache_parser = cache_subparsers.add_parser(
-        "podcast", help="Manage podcast cache"
+    cache_subparsers.add_parser("podcast", help="Manage podcast cache")
+
+
+# Subcommand name -> function adding its subparser, in help order
+SUBPARSER_BUILDERS = {
+    "url": _add_url_parser,
+    "youtube": _add_youtube_parser,
+    "github": _add_github_parser,
+    "reddit": _add_reddit_parser,
+    "steam": _add_steam_parser,
+    "hackernews": _add_hackernews_parser,
+    "google": _add_google_parser,
+    "podcast": _add_podcast_parser,
+    "parse-wallabag": _add_wallabag_parser,
+    "parse-rss": _add_freshrss_parser,
+    "parse": _add_parse_parser,
+    "cache": _add_cache_parser,
+}
+
+
+def create_parser(command=None):
+    """Build the argument parser.
+
+    Args:
+        command (str, optional): If this is a known subcommand, only its
+            subparser is built. Otherwise all subparsers are built, which
+            is what --help and error messages need.
+    """
+    parser = argparse.ArgumentParser(
+        description="Capture web content into markdown files.", prog="capturemd"
+    )
+
+    parser.add_argument(
+        "--version", action="version", version=f"capturemd {__version__}"
     )
 
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+
+    if command in SUBPARSER_BUILDERS:
+        SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for add_subparser in SUBPARSER_BUILDERS.values():
+            add_subparser(subparsers)
+
     return parser
 
 
-def main():
-    parser = create_parser()
-    args = parser.parse_args()
+def _run_parse(args):
+    from capturemd.parse_notes import parse_notes, parse_single_note
 
-    if not args.command or args.command is None:
-        parser.print_help()
-        return 1
+    _apply_meta_cache_flags(args)
 
-    if args.command == "parse":
-        from capturemd.parse_notes import parse_notes, parse_single_note
+    if args.file:
+        file_path = Path(args.file)
+        if not file_path.exists():
+            print(f"Error: File not found: {args.file}")
+            return 1
+        success = parse_single_note(file_path)
+        return 0 if success else 1
+    else:
+        parse_notes(None)
+    return 0
 
-        if args.file:
-            file_path = Path(args.file)
-            if not file_path.exists():
-                print(f"Error: File not found: {args.file}")
-                return 1
-            success = parse_single_note(file_path)
-            return 0 if success else 1
-        else:
-            parse_notes(None)
-        return 0
 
-    # For URL processing commands
-    if args.command in ["url", "youtube", "github", "reddit", "steam", "hackernews"]:
-        # Add command arguments to sys.argv for compatibility with the old script
+def _run_url(args):
+    """Handle the URL processing commands (url, youtube, github, ...)."""
+    from capturemd.url_processor import parse_unparsed_notes, process_url
+
+    # Add command arguments to sys.argv for compatibility with the old script
+    if args.parse:
+        sys.argv.append("--parse")
+
+    _apply_meta_cache_flags(args)
+
+    note_path = process_url(args.url)
+    if note_path and note_path != "google_search_processed":
+        print(note_path)  # Print path to stdout
         if args.parse:
-            sys.argv.append("--parse")
+            parse_unparsed_notes()
 
-        note_path = process_url(args.url)
-        if note_path and note_path != "google_search_processed":
-            print(note_path)  # Print path to stdout
-            if args.parse:
-                parse_unparsed_notes()
+    return 0 if note_path else 1
 
-        return 0 if note_path else 1
 
-    # Handle Google command
-    if args.command == "google":
-        from capturemd.capture_google import capture_google_search
+def _run_google(args):
+    from capturemd.capture_google import capture_google_search
 
-        # Check if the input is a URL or a query
-        query = args.query
-        if query.startswith("http"):
-            # It's a URL, process directly
-            success = capture_google_search(query)
-        else:
-            # It's a query, construct a Google search URL
-            search_url = f"https://www.google.com/search?q={query}"
-            success = capture_google_search(search_url)
+    # Check if the input is a URL or a query
+    query = args.query
+    if query.startswith("http"):
+        # It's a URL, process directly
+        success = capture_google_search(query)
+    else:
+        # It's a query, construct a Google search URL
+        search_url = f"https://www.google.com/search?q={query}"
+        success = capture_google_search(search_url)
 
-        return 0 if success else 1
+    return 0 if success else 1
+
+
+def _run_podcast(args):
+    from capturemd.capture_podcast import process_podcast
+
+    # Process tags (convert comma-separated list to array)
+    tags = [tag.strip() for tag in args.tags.split(",") if tag.strip()]
+
+    note_path = process_podcast(
+        url=args.url,
+        title=args.title,
+        channel=args.channel,
+        description=args.description,
+        published_date=args.published_date,
+        tags=tags,
+    )
+
+    return 0 if note_path else 1
 
-    # Handle podcast command
-    if args.command == "podcast":
-        from capturemd.capture_podcast import process_podcast
 
-        # Process tags (convert comma-separated list to array)
-        tags = [tag.strip() for tag in args.tags.split(",") if tag.strip()]
+def _run_wallabag(args):
+    from capturemd.capture_wallabag import process_wallabag
 
-        note_path = process_podcast(
-            url=args.url,
-            title=args.title,
-            channel=args.channel,
-            description=args.description,
-            published_date=args.published_date,
-            tags=tags,
+    return process_wallabag()
+
+
+def _run_freshrss(args):
+    from capturemd.capture_freshrss import process_freshrss
+
+    return process_freshrss()
+
+
+def _run_cache(args):
+    if args.cache_type == "youtube":
+        from capturemd.cache_manager import (
+            cache_single_youtube_video,
+            convert_flat_structure_to_hierarchical,
+            manage_youtube_cache,
+            regenerate_youtube_nfo_files,
         )
 
-        return 0 if note_path else 1
-
-    # Handle wallabag processing
-    if args.command == "parse-wallabag":
-        from capturemd.capture_wallabag import process_wallabag
-
-        return process_wallabag()
-
-    # Handle FreshRSS processing
-    if args.command == "parse-rss":
-        from capturemd.capture_freshrss import process_freshrss
-
-        return process_freshrss()
-
-    # Handle cache command
-    if args.command == "cache":
-        if args.cache_type == "youtube":
-            from capturemd.cache_manager import (
-                cache_single_youtube_video,
-                convert_flat_structure_to_hierarchical,
-                manage_youtube_cache,
-                regenerate_youtube_nfo_files,
-            )
-
-            if args.regen:
-                regenerate_youtube_nfo_files()
-            elif args.convert_flat_structure:
-                convert_flat_structure_to_hierarchical()
-            elif args.file:
-                file_path = Path(args.file)
-                if not file_path.exists():
-                    print(f"Error: File not found: {args.file}")
-                    return 1
-                success = cache_single_youtube_video(file_path)
-                return 0 if success else 1
-            else:
-                manage_youtube_cache(None)
-            return 0
-        elif args.cache_type == "podcast":
-            from capturemd.cache_manager import manage_podcast_cache
-
-            manage_podcast_cache()
-            return 0
+        if args.regen:
+            regenerate_youtube_nfo_files()
+        elif args.convert_flat_structure:
+            convert_flat_structure_to_hierarchical()
+        elif args.file:
+            file_path = Path(args.file)
+            if not file_path.exists():
+                print(f"Error: File not found: {args.file}")
+                return 1
+            success = cache_single_youtube_video(file_path)
+            return 0 if success else 1
         else:
-            print("Please specify a valid cache type (youtube, podcast)")
-            return 1
+            manage_youtube_cache(None)
+        return 0
+    elif args.cache_type == "podcast":
+        from capturemd.cache_manager import manage_podcast_cache
 
-    return 0
+        manage_podcast_cache()
+        return 0
+    else:
+        print("Please specify a valid cache type (youtube, podcast)")
+        return 1
+
+
+def main():
+    # Only build the subparser for the command being run
+    parser = create_parser(sys.argv[1] if len(sys.argv) > 1 else None)
+    args = parser.parse_args()
+
+    if not args.command or args.command is None:
+        parser.print_help()
+        return 1
+
+    # Each handler imports the modules its command needs when it runs
+    return args.handler(args)
 
 
 if __name__ == "__main__":
@@ -1,48 +1,88 @@
 #!/usr/bin/env python3
 # episode_indexer.py - Handle episode re-indexing for YouTube seasons
 
+import json
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+_EPISODE_RE = re.compile(r"<episode>(\d+)</episode>")
+_EPISODE_TAG_RE = re.compile(r"\n    <episode>\d+</episode>")
+_SEASON_TAG_RE = re.compile(r"(<season>.*?</season>)")
 
-def _extract_episode_info_from_nfo(nfo_path):
+# Sort key for episodes without a usable aired date, after every real one
+FAR_FUTURE_DATE = "9999-12-31"
+
+# NFO files of a season are rewritten concurrently
+NFO_WRITE_WORKERS = 8
+
+# Season stamps (see _season_stamp) as of their last reindex, relative to the
+# cache dir
+REINDEX_STATE_FILE = ".reindex_state.json"
+
+
+def _parse_ymd(date_str):
+    """Parse a YYYY-MM-DD string, much cheaper than strptime for a fixed format.
+
+    Raises:
+        ValueError: If date_str is not a valid YYYY-MM-DD date
+    """
+    if len(date_str) != 10 or date_str[4] != "-" or date_str[7] != "-":
+        raise ValueError(f"not a YYYY-MM-DD date: {date_str!r}")
+    return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+
+
+def _extract_episode_info_from_nfo(nfo_path, content=None):
     """Extract aired date and current episode number from NFO file.
     
+    Args:
+        nfo_path: Path object to the NFO file
+        content: NFO content if already read, otherwise it is read from nfo_path
+    
     Returns:
-        dict: Contains 'nfo_path', 'aired_date' (datetime), 'aired_str' (str), 
-              'content' (str), and 'current_episode' (int or None)
+        dict: Contains 'nfo_path', 'aired_str' (str), 'sort_date' (YYYY-MM-DD
+              str, far future if missing or unparseable), 'content' (str),
+              and 'current_episode' (int or None)
     """
     try:
-        with open(nfo_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        # Extract aired date from NFO
-        aired_match = re.search(r"<aired>(.*?)</aired>", content)
-        aired_date = aired_match.group(1) if aired_match else None
+        if content is None:
+            with open(nfo_path, "r", encoding="utf-8") as f:
+                content = f.read()
+
+        # Extract aired date from NFO, a fixed tag so find and slice will do
+        aired_start = content.find("<aired>")
+        aired_date = None
+        if aired_start != -1:
+            aired_end = content.find("</aired>", aired_start)
+            if aired_end != -1:
+                aired_date = content[aired_start + len("<aired>"):aired_end]
 
         # Extract current episode number if it exists
-        episode_match = re.search(r"<episode>(\d+)</episode>", content)
+        episode_match = _EPISODE_RE.search(content)
         current_episode = int(episode_match.group(1)) if episode_match else None
 
         # Parse the date string
+        # ISO dates sort lexicographically, so the validated string is the key
         if aired_date:
             try:
-                date_obj = datetime.strptime(aired_date, "%Y-%m-%d")
+                _parse_ymd(aired_date)
+                sort_date = aired_date
             except ValueError:
                 print(
                     f"  Warning: Could not parse date '{aired_date}' in {nfo_path.name}"
                 )
                 # Use a far future date for unparseable dates
-                date_obj = datetime.max
+                sort_date = FAR_FUTURE_DATE
         else:
             print(f"  Warning: No aired date found in {nfo_path.name}")
             # Use a far future date for files without aired date
-            date_obj = datetime.max
+            sort_date = FAR_FUTURE_DATE
 
         return {
             "nfo_path": nfo_path,
-            "aired_date": date_obj,
+            "sort_date": sort_date,
             "aired_str": aired_date,
             "content": content,
             "current_episode": current_episode,
@@ -58,7 +98,7 @@ def _remove_episode_tag(content):
     Returns:
         str: Content with episode tag removed
     """
-    return re.sub(r"\n    <episode>\d+</episode>", "", content)
+    return _EPISODE_TAG_RE.sub("", content)
 
 
 def _add_episode_tag(content, episode_num):
@@ -73,14 +113,34 @@ def _add_episode_tag(content, episode_num):
     content = _remove_episode_tag(content)
     
     # Then add the new episode tag after the season tag
-    updated_content = re.sub(
-        r"(<season>.*?</season>)",
+    updated_content = _SEASON_TAG_RE.sub(
         rf"\1\n    <episode>{episode_num}</episode>",
         content,
     )
     return updated_content
 
 
+def _atomic_write(path, data):
+    """Write data to path through a temp file so readers never see a partial NFO."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _try_atomic_write(path, data):
+    """Atomically write data to path.
+
+    Returns:
+        Exception or None: The error if the write failed
+    """
+    try:
+        _atomic_write(path, data)
+        return None
+    except Exception as e:
+        return e
+
+
 def _reindex_season(season_dir, force=False):
     """Re-index a single season directory by aired date.
     
@@ -98,66 +158,129 @@ def _reindex_season(season_dir, force=False):
     if not nfo_files:
         return False
 
+    # Read every NFO once, the content is reused for the check and the update
+    nfo_contents = []
+    for nfo_file in nfo_files:
+        try:
+            with open(nfo_file, "r", encoding="utf-8") as f:
+                nfo_contents.append((nfo_file, f.read()))
+        except Exception as e:
+            print(f"Error reading {nfo_file}: {e}")
+            continue
+
     # Check if any NFO files are missing episode numbers (unless forcing)
     if not force:
-        needs_reindexing = False
-        for nfo_file in nfo_files:
-            try:
-                with open(nfo_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    if "<episode>" not in content:
-                        needs_reindexing = True
-                        break
-            except Exception as e:
-                print(f"Error reading {nfo_file}: {e}")
-                continue
+        needs_reindexing = any(
+            "<episode>" not in content for _, content in nfo_contents
+        )
 
         if not needs_reindexing:
             return False
 
     # Parse all NFO files to get aired dates
     episode_data = []
-    for nfo_file in nfo_files:
-        episode_info = _extract_episode_info_from_nfo(nfo_file)
+    for nfo_file, content in nfo_contents:
+        episode_info = _extract_episode_info_from_nfo(nfo_file, content)
         if episode_info:
             episode_data.append(episode_info)
 
     if not episode_data:
         return False
 
-    # Sort by aired date
-    episode_data.sort(key=lambda x: x["aired_date"])
+    # Sort by aired date, then file name so equal dates order deterministically
+    episode_data.sort(key=lambda x: (x["sort_date"], x["nfo_path"].name))
+
+    # Assign episode numbers (removes old tag if it exists, adds new)
+    updates = [
+        (episode_num, episode_info, _add_episode_tag(episode_info["content"], episode_num))
+        for episode_num, episode_info in enumerate(episode_data, start=1)
+    ]
+
+    # Write only the NFO files whose content changed, concurrently, and report
+    # in order afterwards
+    changed = [
+        (episode_info["nfo_path"], updated_content)
+        for _, episode_info, updated_content in updates
+        if updated_content != episode_info["content"]
+    ]
+    write_errors = {}
+    if changed:
+        with ThreadPoolExecutor(max_workers=NFO_WRITE_WORKERS) as executor:
+            errors = executor.map(lambda change: _try_atomic_write(*change), changed)
+            write_errors = {
+                nfo_path: error
+                for (nfo_path, _), error in zip(changed, errors)
+                if error
+            }
+
+    for episode_num, episode_info, _ in updates:
+        nfo_path = episode_info["nfo_path"]
+        error = write_errors.get(nfo_path)
+        if error:
+            print(f"Error updating {nfo_path}: {error}")
+            continue
 
-    # Assign episode numbers and update NFO files
-    for episode_num, episode_info in enumerate(episode_data, start=1):
-        try:
-            content = episode_info["content"]
-            nfo_path = episode_info["nfo_path"]
+        video_id = nfo_path.stem
+        old_ep = episode_info["current_episode"]
+        if old_ep and old_ep != episode_num:
+            print(
+                f"  Episode {episode_num}: {video_id} ({episode_info['aired_str']}) "
+                f"[was {old_ep}]"
+            )
+        else:
+            print(
+                f"  Episode {episode_num}: {video_id} ({episode_info['aired_str']})"
+            )
 
-            # Update episode number (removes old if exists, adds new)
-            updated_content = _add_episode_tag(content, episode_num)
+    return True
 
-            # Write updated content back to NFO file
-            with open(nfo_path, "w", encoding="utf-8") as f:
-                f.write(updated_content)
 
-            video_id = nfo_path.stem
-            old_ep = episode_info["current_episode"]
-            if old_ep and old_ep != episode_num:
-                print(
-                    f"  Episode {episode_num}: {video_id} ({episode_info['aired_str']}) "
-                    f"[was {old_ep}]"
-                )
-            else:
-                print(
-                    f"  Episode {episode_num}: {video_id} ({episode_info['aired_str']})"
-                )
+def _load_reindex_state(youtube_cache_dir):
+    """Load the {"channel/season": stamp} map of already indexed seasons."""
+    try:
+        with open(youtube_cache_dir / REINDEX_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-        except Exception as e:
-            print(f"Error updating {nfo_path}: {e}")
+
+def _save_reindex_state(youtube_cache_dir, state):
+    """Atomically write the reindex state next to the cached videos."""
+    state_path = youtube_cache_dir / REINDEX_STATE_FILE
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, state_path)
+    except OSError as e:
+        print(f"Error saving reindex state: {e}")
+
+
+def _season_stamp(season_dir):
+    """Latest st_mtime_ns of a season directory and the NFO files in it.
+
+    The directory mtime covers added and removed files, the NFO mtimes cover
+    NFOs rewritten in place, which leave the directory mtime untouched.
+    """
+    stamp = season_dir.stat().st_mtime_ns
+    with os.scandir(season_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".nfo"):
+                stamp = max(stamp, entry.stat().st_mtime_ns)
+    return stamp
+
+
+def _iter_season_dirs(youtube_cache_dir):
+    """Yield (channel_dir, season_dir) for every show/season directory."""
+    for channel_dir in youtube_cache_dir.iterdir():
+        if not channel_dir.is_dir() or channel_dir.name.startswith("."):
             continue
 
-    return True
+        for season_dir in channel_dir.iterdir():
+            if not season_dir.is_dir() or season_dir.name.startswith("."):
+                continue
+
+            yield channel_dir, season_dir
 
 
 def reindex_season_episodes(youtube_cache_dir):
@@ -176,20 +299,23 @@ def reindex_season_episodes(youtube_cache_dir):
 
     print("Re-indexing episode numbers by aired date...")
 
-    # Iterate through all channel directories
-    for channel_dir in youtube_cache_dir.iterdir():
-        if not channel_dir.is_dir() or channel_dir.name.startswith("."):
+    # Seasons whose directory and NFO files haven't changed since the last run
+    # are skipped
+    state = _load_reindex_state(youtube_cache_dir)
+
+    for channel_dir, season_dir in _iter_season_dirs(youtube_cache_dir):
+        season_key = f"{channel_dir.name}/{season_dir.name}"
+        if state.get(season_key) == _season_stamp(season_dir):
             continue
 
-        # Iterate through all season (year) directories
-        for season_dir in channel_dir.iterdir():
-            if not season_dir.is_dir() or season_dir.name.startswith("."):
-                continue
+        if _reindex_season(season_dir, force=False):
+            print(
+                f"\nReindexing season: {channel_dir.name}/{season_dir.name}"
+            )
 
-            if _reindex_season(season_dir, force=False):
-                print(
-                    f"\nReindexing season: {channel_dir.name}/{season_dir.name}"
-                )
+        state[season_key] = _season_stamp(season_dir)
+
+    _save_reindex_state(youtube_cache_dir, state)
 
     print("Episode re-indexing complete")
 
@@ -213,21 +339,19 @@ def force_reindex_season_episodes(youtube_cache_dir):
 
     reindexed_count = 0
 
-    # Iterate through all channel directories
-    for channel_dir in youtube_cache_dir.iterdir():
-        if not channel_dir.is_dir() or channel_dir.name.startswith("."):
-            continue
+    # Stored state is ignored, but refreshed for the next regular reindex
+    state = _load_reindex_state(youtube_cache_dir)
 
-        # Iterate through all season (year) directories
-        for season_dir in channel_dir.iterdir():
-            if not season_dir.is_dir() or season_dir.name.startswith("."):
-                continue
+    for channel_dir, season_dir in _iter_season_dirs(youtube_cache_dir):
+        if _reindex_season(season_dir, force=True):
+            print(
+                f"\nForce reindexing season: {channel_dir.name}/{season_dir.name}"
+            )
+            reindexed_count += 1
 
-            if _reindex_season(season_dir, force=True):
-                print(
-                    f"\nForce reindexing season: {channel_dir.name}/{season_dir.name}"
-                )
-                reindexed_count += 1
+        state[f"{channel_dir.name}/{season_dir.name}"] = _season_stamp(season_dir)
+
+    _save_reindex_state(youtube_cache_dir, state)
 
     print(
         f"Force re-indexing complete. Updated {reindexed_count} season(s)."
@@ -2,12 +2,92 @@
 # error_logger.py - Centralized error logging utility for structured JSON output
 
 import json
+import re
 import sys
 import traceback
-from datetime import datetime
+import time
 from typing import Optional, Dict, Any
 
 
+# Network-related errors
+NETWORK_ERROR_PATTERNS = (
+    "unable to download",
+    "http error",
+    "connection",
+    "timeout",
+    "network",
+    "urlopen error",
+)
+
+# Geo-restriction errors (check before video_unavailable due to overlapping patterns)
+GEO_RESTRICTION_PATTERNS = (
+    "not available in your country",
+    "not made this video available in your country",
+    "geo-restricted",
+    "geo restricted",
+)
+
+# Permission/authentication errors
+PERMISSION_ERROR_PATTERNS = (
+    "sign in",
+    "age-restricted",
+    "restricted",
+    "members-only",
+    "confirm your age",
+    "login required",
+    "requires payment",
+    "paid content",
+)
+
+# Video unavailable errors
+VIDEO_UNAVAILABLE_PATTERNS = (
+    "video unavailable",
+    "video has been removed",
+    "this video is not available",
+    "not made this video available",
+    "private video",
+    "this video is private",
+    "deleted",
+    "video is no longer available",
+    "blocked",
+)
+
+# Format errors
+FORMAT_ERROR_PATTERNS = (
+    "no video formats",
+    "format not available",
+    "requested format",
+    "no suitable formats",
+)
+
+def _compile_patterns(patterns):
+    """Compile substrings into one case-insensitive alternation regex."""
+    return re.compile("|".join(map(re.escape, patterns)), re.IGNORECASE)
+
+
+# yt-dlp error categories in priority order, one case-insensitive regex each
+_CATEGORY_RES = [
+    ("network_error", _compile_patterns(NETWORK_ERROR_PATTERNS)),
+    ("geo_restriction", _compile_patterns(GEO_RESTRICTION_PATTERNS)),
+    ("permission_error", _compile_patterns(PERMISSION_ERROR_PATTERNS)),
+    ("video_unavailable", _compile_patterns(VIDEO_UNAVAILABLE_PATTERNS)),
+    ("format_error", _compile_patterns(FORMAT_ERROR_PATTERNS)),
+]
+
+
+def _iso_now() -> str:
+    """Current UTC time as an ISO 8601 string with millisecond precision."""
+    seconds, millis = divmod(time.time_ns() // 1_000_000, 1000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + f".{millis:03d}Z"
+
+
+def _write_event(error_data: Dict[str, Any]):
+    """Write one compact JSON event per line to stderr."""
+    sys.stderr.write(json.dumps(error_data, separators=(",", ":")) + "\n")
+    # stderr is only guaranteed to be line buffered from Python 3.9
+    sys.stderr.flush()
+
+
 def log_error(
     context: Dict[str, Any],
     error: Exception,
@@ -26,13 +106,17 @@ def log_error(
         **extra: Additional fields to include in the error JSON
     """
     error_data = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _iso_now(),
         "level": "error",
         "context": context,
         "error": {
             "type": error_type or type(error).__name__,
             "message": str(error),
-            "details": traceback.format_exc() if error else None
+            "details": (
+                traceback.format_exc()
+                if error and sys.exc_info()[0] is not None
+                else None
+            )
         }
     }
     
@@ -44,10 +128,7 @@ def log_error(
     for key, value in extra.items():
         error_data[key] = value
     
-    # Write to stderr
-    json.dump(error_data, sys.stderr)
-    sys.stderr.write("\n")
-    sys.stderr.flush()
+    _write_event(error_data)
 
 
 def classify_ytdlp_error(stderr_output: str, exit_code: int) -> str:
@@ -61,64 +142,10 @@ def classify_ytdlp_error(stderr_output: str, exit_code: int) -> str:
     Returns:
         str: Error type classification
     """
-    stderr_lower = stderr_output.lower()
-    
-    # Network-related errors
-    if any(pattern in stderr_lower for pattern in [
-        "unable to download",
-        "http error",
-        "connection",
-        "timeout",
-        "network",
-        "urlopen error"
-    ]):
-        return "network_error"
-    
-    # Geo-restriction errors (check before video_unavailable due to overlapping patterns)
-    if any(pattern in stderr_lower for pattern in [
-        "not available in your country",
-        "not made this video available in your country",
-        "geo-restricted",
-        "geo restricted"
-    ]):
-        return "geo_restriction"
-    
-    # Permission/authentication errors
-    if any(pattern in stderr_lower for pattern in [
-        "sign in",
-        "age-restricted",
-        "restricted",
-        "members-only",
-        "confirm your age",
-        "login required",
-        "requires payment",
-        "paid content"
-    ]):
-        return "permission_error"
-    
-    # Video unavailable errors
-    if any(pattern in stderr_lower for pattern in [
-        "video unavailable",
-        "video has been removed",
-        "this video is not available",
-        "not made this video available",
-        "private video",
-        "this video is private",
-        "deleted",
-        "video is no longer available",
-        "blocked"
-    ]):
-        return "video_unavailable"
-    
-    # Format errors
-    if any(pattern in stderr_lower for pattern in [
-        "no video formats",
-        "format not available",
-        "requested format",
-        "no suitable formats"
-    ]):
-        return "format_error"
-    
+    for name, pattern_re in _CATEGORY_RES:
+        if pattern_re.search(stderr_output):
+            return name
+
     # Unknown error
     return "unknown_error"
 
@@ -157,7 +184,7 @@ def log_subprocess_error(
     error_msg = f"Subprocess failed with exit code {exit_code}"
     
     error_data = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": _iso_now(),
         "level": "error",
         "context": context,
         "error": {
@@ -168,7 +195,4 @@ def log_subprocess_error(
         "subprocess": subprocess_info
     }
     
-    # Write to stderr
-    json.dump(error_data, sys.stderr)
-    sys.stderr.write("\n")
-    sys.stderr.flush()
+    _write_event(error_data)
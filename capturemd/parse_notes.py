@@ -6,11 +6,11 @@ import json
 import os
 import re
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
 
-import yaml
-
 from .paths import MARKDOWN_DIR
 
 try:
@@ -21,22 +21,76 @@ except ImportError:
 # Paths
 SCRIPTS_DIR = Path(__file__).parent
 
+# Notes are read and parsed concurrently, mostly waiting on disk and network
+DEFAULT_PARSE_WORKERS = 8
+
+def _parse_workers(value):
+    """Worker count from CAPTUREMD_PARSE_WORKERS, the default if unset or invalid."""
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PARSE_WORKERS
+    return workers if workers >= 1 else DEFAULT_PARSE_WORKERS
+
+PARSE_WORKERS = _parse_workers(os.getenv("CAPTUREMD_PARSE_WORKERS"))
+
+# Parser modules already loaded by load_parser_module, keyed by scope
+_parser_modules = {}
+
+# Keeps output lines from concurrent parses from interleaving
+_print_lock = threading.Lock()
+
+# YAML frontmatter block at the start of a note
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+
+# Cheap pre-check on the raw bytes before any YAML parsing
+FRONTMATTER_HEAD_SIZE = 4096
+_FRONTMATTER_BYTES_RE = re.compile(rb"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+_PARSED_FALSE_RE = re.compile(rb"^parsed:\s*(?:false|False|FALSE)\s*$", re.MULTILINE)
+
 
 # Custom YAML representer for date objects
 def date_representer(dumper, data):
     return dumper.represent_scalar("tag:yaml.org,2002:timestamp", data.isoformat())
 
 
-# Register the date representer
-yaml.add_representer(date, date_representer)
+# PyYAML is imported on first use, see _get_yaml
+_yaml = None
+_Loader = None
+_Dumper = None
+
+
+def _get_yaml():
+    """Import PyYAML, pick the libyaml-backed safe loader/dumper if available
+    and register the date representer, once."""
+    global _yaml, _Loader, _Dumper
+    if _yaml is None:
+        import yaml
+
+        try:
+            from yaml import CSafeDumper as dumper
+            from yaml import CSafeLoader as loader
+        except ImportError:
+            from yaml import SafeDumper as dumper
+            from yaml import SafeLoader as loader
+
+        dumper.add_representer(date, date_representer)
+        _Loader, _Dumper = loader, dumper
+        _yaml = yaml
+    return _yaml
 
 
 def extract_frontmatter(content):
     """Extract YAML frontmatter from markdown content."""
-    match = re.match(r"^---\s*\n(.*?)\n---\s*\n", content, re.DOTALL)
+    # Cheap gate before the regex, frontmatter has to open the file
+    if not content.startswith("---"):
+        return None, content
+
+    match = _FRONTMATTER_RE.match(content)
     if match:
+        yaml = _get_yaml()
         try:
-            frontmatter = yaml.safe_load(match.group(1))
+            frontmatter = yaml.load(match.group(1), Loader=_Loader)
             rest_content = content[match.end() :]
             return frontmatter, rest_content
         except yaml.YAMLError:
@@ -46,38 +100,94 @@ def extract_frontmatter(content):
 
 def save_with_frontmatter(file_path, frontmatter, content):
     """Save markdown file with updated frontmatter."""
-    frontmatter_yaml = yaml.dump(frontmatter, sort_keys=False, default_flow_style=False)
+    yaml = _get_yaml()
+    frontmatter_yaml = yaml.dump(
+        frontmatter, Dumper=_Dumper, sort_keys=False, default_flow_style=False
+    )
     with open(file_path, "w", encoding="utf-8") as f:
         f.write(f"---\n{frontmatter_yaml}---\n{content}")
 
 
+def _iter_markdown_files(root):
+    """Yield paths of all markdown files under root, one scandir per directory."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Symlinked directories aren't followed, a link back up
+                    # the tree would yield the same notes over and over
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".md") and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            continue
+
+
+def _read_if_unparsed(file_path):
+    """Return the note's text if its frontmatter says parsed: false, else None.
+
+    Only the head of the file is read for notes that are already parsed.
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(FRONTMATTER_HEAD_SIZE)
+        match = _FRONTMATTER_BYTES_RE.match(head)
+        if not match and len(head) == FRONTMATTER_HEAD_SIZE:
+            # Frontmatter longer than the head, fall back to the whole file
+            head += f.read()
+            match = _FRONTMATTER_BYTES_RE.match(head)
+        if not match or not _PARSED_FALSE_RE.search(match.group(1)):
+            return None
+
+    # Unparsed notes are rare, re-read them as text for the full content
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _print(*args, **kwargs):
+    with _print_lock:
+        print(*args, **kwargs)
+
+
 def find_unparsed_notes(locator=None):
     """Find all notes with parsed=false, optionally filtered by locator."""
     unparsed_notes = []
 
-    for directory in MARKDOWN_DIR.glob("**/"):
-        for file_path in directory.glob("*.md"):
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            frontmatter, rest_content = extract_frontmatter(content)
-            if frontmatter and frontmatter.get("parsed") is False:
-                if locator is not None:
-                    if frontmatter.get("locator") != locator:
-                        continue
-                unparsed_notes.append(
-                    {
-                        "path": file_path,
-                        "frontmatter": frontmatter,
-                        "content": rest_content,
-                    }
-                )
+    file_paths = list(_iter_markdown_files(MARKDOWN_DIR))
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+        contents = list(executor.map(_read_if_unparsed, file_paths))
+
+    for file_path, content in zip(file_paths, contents):
+        if content is None:
+            continue
+
+        frontmatter, rest_content = extract_frontmatter(content)
+        if frontmatter and frontmatter.get("parsed") is False:
+            if locator is not None:
+                if frontmatter.get("locator") != locator:
+                    continue
+            unparsed_notes.append(
+                {
+                    "path": file_path,
+                    "frontmatter": frontmatter,
+                    "content": rest_content,
+                }
+            )
 
     return unparsed_notes
 
 
 def load_parser_module(scope):
-    """Load the parser module for the given scope."""
+    """Load the parser module for the given scope.
+
+    Successfully loaded modules are kept for the rest of the process, failed
+    loads are retried on the next call.
+    """
+    if scope in _parser_modules:
+        return _parser_modules[scope]
+
     module_name = f"capture_{scope}"
     module_path = SCRIPTS_DIR / f"{module_name}.py"
 
@@ -100,6 +210,7 @@ def load_parser_module(scope):
         if spec and spec.loader:
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
+            _parser_modules[scope] = module
             return module
     except Exception as e:
         print(f"Error loading parser module for {scope}: {e}")
@@ -117,15 +228,20 @@ def load_parser_module(scope):
     return None
 
 
-def parse_note(note):
-    """Parse a single note using its scope-specific parser."""
+def parse_note(note, parser_module=None):
+    """Parse a single note using its scope-specific parser.
+    
+    Args:
+        note (dict): Note as returned by find_unparsed_notes
+        parser_module (module, optional): Already loaded parser for the note's scope
+    """
     scope = note["frontmatter"].get("scope")
     note_path = str(note["path"])
     note_id = note["frontmatter"].get("id", "unknown")
     locator = note["frontmatter"].get("locator", "unknown")
 
     if not scope:
-        print(f"No scope defined for note: {note_path}")
+        _print(f"No scope defined for note: {note_path}")
         error = ValueError("No scope defined for note")
         log_error(
             context={
@@ -139,7 +255,8 @@ def parse_note(note):
         )
         return False
 
-    parser_module = load_parser_module(scope)
+    if parser_module is None:
+        parser_module = load_parser_module(scope)
     if not parser_module:
         # Error already logged in load_parser_module
         return False
@@ -163,16 +280,16 @@ def parse_note(note):
             # Update the frontmatter
             updated_frontmatter["parsed"] = True
 
-            # Merge tags (keep both original and new tags, removing duplicates)
+            # Merge tags (keep both original and new tags, removing duplicates
+            # while preserving first-seen order)
             new_tags = updated_frontmatter.get("tags", [])
-            merged_tags = list(set(original_tags + new_tags))
-            updated_frontmatter["tags"] = merged_tags
+            updated_frontmatter["tags"] = list(dict.fromkeys([*original_tags, *new_tags]))
 
             save_with_frontmatter(note["path"], updated_frontmatter, content)
-            print(f"Successfully parsed note: {note_path}")
+            _print(f"Successfully parsed note: {note_path}")
             return True
         else:
-            print(f"Failed to parse note: {note_path}")
+            _print(f"Failed to parse note: {note_path}")
             error = RuntimeError("Parser returned None or empty result")
             log_error(
                 context={
@@ -187,7 +304,7 @@ def parse_note(note):
             )
             return False
     except Exception as e:
-        print(f"Error parsing note {note_path}: {e}")
+        _print(f"Error parsing note {note_path}: {e}")
         log_error(
             context={
                 "operation": "parse",
@@ -243,13 +360,48 @@ def parse_single_note(file_path):
         return False
 
 
+def _parse_scope_notes(parser_module, notes):
+    """Parse the notes of one scope one after the other.
+
+    Parser modules aren't thread-safe (capture_github looks up and creates
+    topic notes without a lock), so only different scopes run concurrently.
+    """
+    for note in notes:
+        parse_note(note, parser_module)
+
+
 def parse_notes(locator=None):
     """Parse unparsed notes, optionally only the one with the given locator."""
     unparsed_notes = find_unparsed_notes(locator)
     print(f"Found {len(unparsed_notes)} unparsed notes.")
 
+    # Load each parser once and let it batch its lookups for all its notes
+    notes_by_scope = {}
+    unscoped_notes = []
     for note in unparsed_notes:
-        parse_note(note)
+        scope = note["frontmatter"].get("scope")
+        if scope:
+            notes_by_scope.setdefault(scope, []).append(note)
+        else:
+            # Only reported by parse_note
+            unscoped_notes.append(note)
+
+    parser_modules = {}
+    for scope, notes in notes_by_scope.items():
+        parser_module = load_parser_module(scope)
+        parser_modules[scope] = parser_module
+        if parser_module and hasattr(parser_module, "prefetch"):
+            parser_module.prefetch([note["frontmatter"] for note in notes])
+
+    scope_notes = [(None, unscoped_notes)]
+    for scope, notes in notes_by_scope.items():
+        if not parser_modules[scope]:
+            # Loading the parser failed, error already logged above
+            continue
+        scope_notes.append((parser_modules[scope], notes))
+
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+        list(executor.map(lambda group: _parse_scope_notes(*group), scope_notes))
 
 
 def main():
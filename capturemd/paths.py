@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 CAPTUREMD_SHARE_BASE = os.getenv("CAPTUREMD_SHARE_BASE", str(Path.home() / "share"))
@@ -13,15 +14,15 @@ MARKDOWN_DIR = SHARE_PATH / "notes" / "resource"
 
 NOTES_RESOURCE_DIR = MARKDOWN_DIR
 YOUTUBE_DIR = MARKDOWN_DIR / "youtube"
-YOUTUBE_NOTES_DIR = MARKDOWN_DIR / "youtube"
+YOUTUBE_NOTES_DIR = YOUTUBE_DIR
 GITHUB_DIR = MARKDOWN_DIR / "github"
 REDDIT_DIR = MARKDOWN_DIR / "reddit"
 STEAM_DIR = MARKDOWN_DIR / "steam"
 HN_DIR = MARKDOWN_DIR / "hn"
 DEFAULT_DIR = MARKDOWN_DIR / "bookmark"
-BOOKMARK_NOTES_DIR = MARKDOWN_DIR / "bookmark"
+BOOKMARK_NOTES_DIR = DEFAULT_DIR
 PODCAST_DIR = MARKDOWN_DIR / "podcast"
-PODCAST_NOTES_DIR = MARKDOWN_DIR / "podcast"
+PODCAST_NOTES_DIR = PODCAST_DIR
 
 TOPIC_LANG_DIR = SHARE_PATH / "notes" / "topic" / "lang"
 
@@ -30,9 +31,13 @@ PODCAST_CACHE_DIR = MEDIA_PATH / "podcasts"
 
 BROWSER_NOTES_FILE = SHARE_PATH / "notes" / "browser_notes.md"
 
+CAPTUREMD_CACHE_BASE = os.getenv("XDG_CACHE_HOME", str(Path.home() / ".cache"))
+CACHE_DIR = Path(CAPTUREMD_CACHE_BASE) / "capturemd"
 
+
+@lru_cache(maxsize=1)
 def ensure_directories():
-    """Create all required directories if they don't exist."""
+    """Create all required directories if they don't exist (once per process)."""
     directories = [
         MARKDOWN_DIR,
         YOUTUBE_DIR,
@@ -49,5 +54,7 @@ def ensure_directories():
         YOUTUBE_CACHE_DIR,
         PODCAST_CACHE_DIR,
     ]
-    for directory in directories:
-        directory.mkdir(parents=True, exist_ok=True)
+    # Aliased directories appear twice, only touch each one once
+    for directory in dict.fromkeys(directories):
+        if not directory.is_dir():
+            directory.mkdir(parents=True, exist_ok=True)
@@ -5,29 +5,69 @@ import sys
 import os
 import re
 import uuid
-import pyperclip
-from urllib.parse import urlparse, parse_qs
-import yaml
+from functools import lru_cache, partial
+from urllib.parse import urlsplit, unquote_plus
 from pathlib import Path
-import subprocess
 import json
-from datetime import datetime
 
 from .paths import (
-    MARKDOWN_DIR, YOUTUBE_DIR, GITHUB_DIR, REDDIT_DIR,
+    CACHE_DIR, MARKDOWN_DIR, YOUTUBE_DIR, GITHUB_DIR, REDDIT_DIR,
     STEAM_DIR, HN_DIR, DEFAULT_DIR
 )
 
-# Templates directory (still local to this file)
-TEMPLATES_DIR = Path(__file__).parent / "templates"
+# Note directories already created by this process, see _write_note
+_ready_dirs = set()
 
-# Ensure directories exist
-for directory in [YOUTUBE_DIR, GITHUB_DIR, REDDIT_DIR, STEAM_DIR, HN_DIR, DEFAULT_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+# Hosts each URL type is recognized on
+YOUTUBE_DOMAINS = ('youtube.com', 'www.youtube.com', 'm.youtube.com', 'youtu.be')
+# Share endpoints carrying the actual video URL in their url= parameter
+YOUTUBE_SHARE_DOMAINS = ('youtube.com', 'www.youtube.com')
+YOUTUBE_SHARE_PATHS = ('/redirect', '/oembed')
+GITHUB_DOMAINS = ('github.com', 'www.github.com')
+REDDIT_DOMAINS = ('reddit.com', 'www.reddit.com', 'old.reddit.com')
+STEAM_DOMAINS = ('store.steampowered.com', 'www.store.steampowered.com')
+HN_DOMAINS = ('news.ycombinator.com', 'www.news.ycombinator.com')
+GOOGLE_DOMAINS = ('google.com', 'www.google.com')
+
+@lru_cache(maxsize=1024)
+def _split(url):
+    """Split a URL once, every predicate and extractor below shares the result."""
+    return urlsplit(url)
+
+
+# key=value pairs of the query parameters looked up by the predicates/extractors
+_QS_KEY_RES = {
+    key: re.compile(rf"(?:^|&){re.escape(key)}=([^&]*)")
+    for key in ('v', 'id', 'q', 'url')
+}
+
+def _qs_get(query, key):
+    """
+    Get the first non-blank value of a query parameter, decoded like parse_qs.
+    
+    Returns:
+        str or None: None if the parameter is missing or only has blank values
+    """
+    for match in _QS_KEY_RES[key].finditer(query):
+        if match.group(1):
+            return unquote_plus(match.group(1))
+    return None
+
+
+# Path shapes of capturable items, anchored at the start of the raw path. Runs
+# of slashes around the path are skipped as if it had been strip('/')-ed and
+# split on "/"; the groups are what the get_*_info helpers return
+_GITHUB_PATH_RE = re.compile(r"/*(?!\.)([^/]+)/(?=/*[^/])(?!\.)([^/]*)")
+_REDDIT_PATH_RE = re.compile(r"/*r/([^/]*)/comments/([^/]+)")
+_STEAM_PATH_RE = re.compile(r"/*app/([0-9]+)(?:/([^/]*))?(?:/|$)")
+# The group is the video ID
+_SHORTS_PATH_RE = re.compile(r"/shorts/+([^/]+)")
+
+
+def _path_match(pattern, url):
+    """Match one of the path shapes above against the path of url."""
+    return pattern.match(_split(url).path)
 
-# Ensure directories exist
-for directory in [YOUTUBE_DIR, GITHUB_DIR, REDDIT_DIR, STEAM_DIR, HN_DIR, DEFAULT_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
 
 def extract_url_from_share_param(url):
     """
@@ -40,21 +80,46 @@ def extract_url_from_share_param(url):
         str or None: The extracted URL if found and valid, None otherwise
     """
     try:
-        parsed_url = urlparse(url)
-        query_params = parse_qs(parsed_url.query)
+        extracted_url = _qs_get(_split(url).query, 'url')
         
-        if 'url' in query_params:
-            extracted_url = query_params['url'][0]
+        if extracted_url:
             # Validate that we got a proper URL
-            result = urlparse(extracted_url)
+            result = _split(extracted_url)
             if all([result.scheme, result.netloc]):
                 return extracted_url
-    except (ValueError, IndexError, KeyError):
+    except ValueError:
         pass
     
     return None
 
 
+def _is_share_path(parsed_url):
+    """Check if a split URL is a YouTube redirect or oEmbed endpoint."""
+    return parsed_url.netloc in YOUTUBE_SHARE_DOMAINS and parsed_url.path in YOUTUBE_SHARE_PATHS
+
+
+def _youtube_video_id(url):
+    """Get the ID of a YouTube video URL, directly or through one share URL, or None."""
+    parsed_url = _split(url)
+    if _is_share_path(parsed_url):
+        url = extract_url_from_share_param(url)
+        if not url:
+            return None
+        parsed_url = _split(url)
+    
+    if parsed_url.netloc not in YOUTUBE_DOMAINS:
+        return None
+    if parsed_url.netloc == 'youtu.be':
+        # Short URL format
+        return parsed_url.path.strip('/') or None
+    # Standard URL format with /watch path
+    if parsed_url.path == '/watch':
+        return _qs_get(parsed_url.query, 'v')
+    # YouTube shorts format
+    match = _SHORTS_PATH_RE.match(parsed_url.path)
+    return match.group(1) if match else None
+
+
 def is_youtube_share_url(url):
     """
     Check if URL is a YouTube share/redirect URL.
@@ -66,145 +131,327 @@ def is_youtube_share_url(url):
     These URLs contain the actual video URL in the 'url' query parameter,
     which may be URL-encoded.
     """
-    try:
-        parsed_url = urlparse(url)
-        
-        # Check if it's a YouTube redirect or oEmbed domain
-        if parsed_url.netloc in ['youtube.com', 'www.youtube.com']:
-            # Check for both /redirect and /oembed paths
-            if parsed_url.path in ['/redirect', '/oembed']:
-                # Extract the URL from the 'url' parameter
-                extracted_url = extract_url_from_share_param(url)
-                if extracted_url:
-                    # Recursively check if the extracted URL is a YouTube video
-                    return is_youtube_video(extracted_url)
-    except (ValueError, TypeError):
-        pass
-    
-    return False
+    return _is_share_path(_split(url)) and _youtube_video_id(url) is not None
 
 
 def is_youtube_video(url):
-    """Check if URL is a YouTube video."""
-    # First check if it's a share/redirect URL
-    if is_youtube_share_url(url):
-        return True
-    
-    parsed_url = urlparse(url)
-    youtube_domains = ['youtube.com', 'www.youtube.com', 'm.youtube.com', 'youtu.be']
-    
-    if parsed_url.netloc in youtube_domains:
-        if parsed_url.netloc == 'youtu.be':
-            # Short URL format
-            return parsed_url.path.strip('/') != ''
-        else:
-            # Standard URL format with /watch path
-            if parsed_url.path == '/watch' and 'v' in parse_qs(parsed_url.query):
-                return True
-            # YouTube shorts format
-            elif parsed_url.path.startswith('/shorts/') and parsed_url.path.strip('/shorts/') != '':
-                return True
-    return False
+    """Check if URL is a YouTube video, directly or through one share/redirect URL."""
+    return _youtube_video_id(url) is not None
 
 def is_github_repo(url):
     """Check if URL is a GitHub repository."""
-    parsed_url = urlparse(url)
-    if parsed_url.netloc in ['github.com', 'www.github.com']:
-        path_parts = parsed_url.path.strip('/').split('/')
+    if _split(url).netloc in GITHUB_DOMAINS:
         # Check if path has format: username/repository
-        return len(path_parts) >= 2 and not path_parts[0].startswith('.') and not path_parts[1].startswith('.')
+        return _path_match(_GITHUB_PATH_RE, url) is not None
     return False
     
 def is_reddit_thread(url):
     """Check if URL is a Reddit thread."""
-    parsed_url = urlparse(url)
-    if parsed_url.netloc in ['reddit.com', 'www.reddit.com', 'old.reddit.com']:
-        path_parts = parsed_url.path.strip('/').split('/')
+    if _split(url).netloc in REDDIT_DOMAINS:
         # Check if path has format: r/subreddit/comments/id/...
-        return (len(path_parts) >= 4 and 
-                path_parts[0] == 'r' and 
-                path_parts[2] == 'comments' and 
-                path_parts[3] != '')
+        return _path_match(_REDDIT_PATH_RE, url) is not None
     return False
 
 def is_steam_game(url):
     """Check if URL is a Steam game."""
-    parsed_url = urlparse(url)
-    if parsed_url.netloc in ['store.steampowered.com', 'www.store.steampowered.com']:
-        path_parts = parsed_url.path.strip('/').split('/')
+    if _split(url).netloc in STEAM_DOMAINS:
         # Check if path has format: app/appid/...
-        return (len(path_parts) >= 2 and 
-                path_parts[0] == 'app' and 
-                path_parts[1].isdigit())
+        return _path_match(_STEAM_PATH_RE, url) is not None
     return False
 
 def is_hackernews_item(url):
     """Check if URL is a Hacker News item."""
-    parsed_url = urlparse(url)
-    if parsed_url.netloc in ['news.ycombinator.com', 'www.news.ycombinator.com']:
+    parsed_url = _split(url)
+    if parsed_url.netloc in HN_DOMAINS:
         # Check if path has format: item?id=...
-        return parsed_url.path == '/item' and 'id' in parse_qs(parsed_url.query)
+        return parsed_url.path == '/item' and _qs_get(parsed_url.query, 'id') is not None
     return False
 
 def is_google_search(url):
     """Check if URL is a Google search query."""
-    parsed_url = urlparse(url)
-    if parsed_url.netloc in ['google.com', 'www.google.com']:
+    parsed_url = _split(url)
+    if parsed_url.netloc in GOOGLE_DOMAINS:
         # Check if path is /search and query has q parameter
-        return parsed_url.path == '/search' and 'q' in parse_qs(parsed_url.query)
+        return parsed_url.path == '/search' and _qs_get(parsed_url.query, 'q') is not None
     return False
 
 def get_youtube_video_id(url):
     """Extract YouTube video ID from URL, including share/redirect URLs."""
-    # First check if it's a share/redirect URL and extract the actual URL
-    extracted_url = extract_url_from_share_param(url)
-    if extracted_url:
-        url = extracted_url
-    
-    parsed_url = urlparse(url)
-    if parsed_url.netloc == 'youtu.be':
-        return parsed_url.path.strip('/')
-    elif parsed_url.path.startswith('/shorts/'):
-        # Handle YouTube shorts format - remove /shorts/ prefix and trailing slash
-        return parsed_url.path[8:].strip('/')
-    else:
-        return parse_qs(parsed_url.query)['v'][0]
+    return _youtube_video_id(url)
 
 def get_github_repo_info(url):
     """Extract GitHub repository info from URL."""
-    parsed_url = urlparse(url)
-    path_parts = parsed_url.path.strip('/').split('/')
+    owner, repo = _path_match(_GITHUB_PATH_RE, url).groups()
     return {
-        'owner': path_parts[0],
-        'repo': path_parts[1]
+        'owner': owner,
+        'repo': repo
     }
     
 def get_reddit_thread_info(url):
     """Extract Reddit thread info from URL."""
-    parsed_url = urlparse(url)
-    path_parts = parsed_url.path.strip('/').split('/')
+    subreddit, thread_id = _path_match(_REDDIT_PATH_RE, url).groups()
     return {
-        'subreddit': path_parts[1],
-        'thread_id': path_parts[3]
+        'subreddit': subreddit,
+        'thread_id': thread_id
     }
 
 def get_steam_game_info(url):
     """Extract Steam game info from URL."""
-    parsed_url = urlparse(url)
-    path_parts = parsed_url.path.strip('/').split('/')
+    app_id, name = _path_match(_STEAM_PATH_RE, url).groups()
     return {
-        'app_id': path_parts[1],
-        'name': path_parts[2] if len(path_parts) > 2 else ''
+        'app_id': app_id,
+        'name': name or ''
     }
 
 def get_hackernews_item_info(url):
     """Extract Hacker News item info from URL."""
-    parsed_url = urlparse(url)
-    query_params = parse_qs(parsed_url.query)
     return {
-        'item_id': query_params['id'][0]
+        'item_id': _qs_get(_split(url).query, 'id')
     }
 
+def _extract_youtube(url):
+    video_id = _youtube_video_id(url)
+    return (video_id, {}) if video_id is not None else None
+
+def _extract_github(url):
+    match = _path_match(_GITHUB_PATH_RE, url)
+    return ("/".join(match.groups()), {}) if match else None
+
+def _extract_reddit(url):
+    match = _path_match(_REDDIT_PATH_RE, url)
+    return (match.group(2), {"subreddit": match.group(1)}) if match else None
+
+def _extract_steam(url):
+    match = _path_match(_STEAM_PATH_RE, url)
+    return (match.group(1), {}) if match else None
+
+def _extract_hackernews(url):
+    parsed_url = _split(url)
+    if parsed_url.path != '/item':
+        return None
+    item_id = _qs_get(parsed_url.query, 'id')
+    return (item_id, {}) if item_id is not None else None
+
+def _extract_google(url):
+    parsed_url = _split(url)
+    if parsed_url.path == '/search' and _qs_get(parsed_url.query, 'q') is not None:
+        return None, {}
+    return None
+
+# URL type for each known host: (note type, extractor). The extractor checks
+# the path/query shape, since not every URL on a known host is capturable, and
+# returns (locator, extra frontmatter fields) or None.
+NETLOC_HANDLERS = {
+    domain: handler
+    for domains, handler in (
+        (GOOGLE_DOMAINS, ("google", _extract_google)),
+        (YOUTUBE_DOMAINS, ("youtube", _extract_youtube)),
+        (GITHUB_DOMAINS, ("github", _extract_github)),
+        (REDDIT_DOMAINS, ("reddit", _extract_reddit)),
+        (STEAM_DOMAINS, ("steam", _extract_steam)),
+        (HN_DOMAINS, ("hackernews", _extract_hackernews)),
+    )
+    for domain in domains
+}
+
+# How process_url reports each URL type
+_URL_LABELS = {
+    "google": "Google search query",
+    "youtube": "YouTube video",
+    "github": "GitHub repository",
+    "reddit": "Reddit thread",
+    "steam": "Steam game",
+    "hackernews": "Hacker News item",
+    "default": "generic URL",
+}
+
+# Notes directory of each note type deduplicated on a locator
+_SCOPE_DIRS = {
+    "youtube": YOUTUBE_DIR,
+    "github": GITHUB_DIR,
+    "reddit": REDDIT_DIR,
+    "steam": STEAM_DIR,
+    "hackernews": HN_DIR,
+}
+
+def classify_and_extract(url):
+    """
+    Classify a URL and extract its locator in a single pass.
+    
+    Returns:
+        tuple: (note_type, locator, extras) where extras are additional
+               frontmatter fields. ("default", None, {}) for anything that
+               isn't a recognized item on a known host, google searches
+               have no locator either.
+    """
+    handler = NETLOC_HANDLERS.get(_split(url).netloc)
+    if handler:
+        note_type, extract = handler
+        extracted = extract(url)
+        if extracted is not None:
+            locator, extras = extracted
+            return note_type, locator, extras
+    return "default", None, {}
+
+# Per-directory locator -> note path maps, valid while the directory mtime
+# (which changes whenever a note is added, removed or renamed) is unchanged
+LOCATOR_INDEX_DIR = CACHE_DIR / "locators"
+
+# Indexes already loaded or built by this process: directory -> (mtime_ns, locators)
+_locators_cache = {}
+
+# Locator line of a note's frontmatter, value possibly quoted by a YAML dump.
+# Searched in the raw bytes, no need to decode whole notes to find one line
+_LOCATOR_LINE_RE = re.compile(rb"^locator: (.+?)\s*$", re.MULTILINE)
+
+# Bytes read from the start of a note to find its frontmatter, which is
+# normally a handful of short lines
+FRONTMATTER_HEAD = 512
+
+# Frontmatter delimiters, tolerating trailing whitespace and CRLF line endings
+# like parse_notes does
+_FRONTMATTER_OPEN_RE = re.compile(rb"---\s*\n")
+_FRONTMATTER_RE = re.compile(rb"---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+
+def _index_file(directory):
+    """Path of the on-disk locator index for a notes directory."""
+    return LOCATOR_INDEX_DIR / f"{directory.name}.json"
+
+def _read_frontmatter(f):
+    """Read the raw frontmatter block of an open note file, or None if it has none."""
+    head = f.read(FRONTMATTER_HEAD)
+    if not _FRONTMATTER_OPEN_RE.match(head):
+        return None
+    while True:
+        match = _FRONTMATTER_RE.match(head)
+        if match:
+            return match.group(1)
+        # Long tag lists or URLs can push the closing delimiter past the head
+        chunk = f.read(FRONTMATTER_HEAD * 8)
+        if not chunk:
+            # The closing delimiter may be the last line, without a newline
+            match = _FRONTMATTER_RE.match(head + b"\n")
+            return match.group(1) if match else None
+        head += chunk
+
+def _read_locator(file_path):
+    """Get the locator of a note file, or None if it doesn't have one."""
+    with open(file_path, 'rb') as f:
+        frontmatter = _read_frontmatter(f)
+    if frontmatter is None:
+        return None
+    match = _LOCATOR_LINE_RE.search(frontmatter)
+    if not match:
+        return None
+    locator = match.group(1).decode('utf-8')
+    if len(locator) > 1 and locator[0] == locator[-1] and locator[0] in "'\"":
+        locator = locator[1:-1]
+    return locator
+
+def _scan_locators(directory, known=None):
+    """
+    Build a locator -> note path map of the notes in directory.
+    
+    Args:
+        directory (Path): Notes directory to scan
+        known (dict, optional): Note path -> locator of an earlier scan, those
+            notes are taken from the directory listing without being opened
+    """
+    known = known or {}
+    locators = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.md'):
+                continue
+            file_path = entry.path
+            locator = known.get(file_path)
+            if locator is None:
+                if not entry.is_file():
+                    continue
+                locator = _read_locator(file_path)
+                if locator is None:
+                    continue
+            locators.setdefault(locator, file_path)
+    return locators
+
+def _save_index(directory, mtime_ns, locators):
+    """Persist the locator index of directory, recorded against its mtime."""
+    index_file = _index_file(directory)
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    # Per-process temp file, batch workers may save the same index concurrently
+    tmp_file = index_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(
+            {"directory": str(directory), "mtime_ns": mtime_ns, "locators": locators}, f
+        )
+    os.replace(tmp_file, index_file)
+    _locators_cache[directory] = (mtime_ns, locators)
+
+def _load_index(directory):
+    """Load the stored locator index of directory, or None if there isn't a usable one."""
+    try:
+        with open(_index_file(directory), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index["directory"] == str(directory):
+            return index
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def _known_locators(directory):
+    """
+    Get the locator -> note path map of a notes directory.
+    
+    Kept in memory and on disk as long as it was recorded for the current
+    directory mtime, otherwise the directory is re-indexed, only opening the
+    notes the outdated index doesn't already know about.
+    """
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        # Created on first note, nothing to index yet
+        return {}
+    cached = _locators_cache.get(directory)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    
+    index = _load_index(directory) if cached is None else None
+    if index and index["mtime_ns"] == mtime_ns:
+        _locators_cache[directory] = (mtime_ns, index["locators"])
+        return index["locators"]
+    
+    outdated = cached[1] if cached else index["locators"] if index else {}
+    known = {path: locator for locator, path in outdated.items()}
+    locators = _scan_locators(directory, known)
+    _save_index(directory, mtime_ns, locators)
+    return locators
+
+def _rebuild_index(directory):
+    """Re-index directory regardless of the recorded mtime, reusing known entries."""
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return
+    index = _load_index(directory)
+    known = {}
+    if index:
+        known = {path: locator for locator, path in index["locators"].items()}
+    _save_index(directory, mtime_ns, _scan_locators(directory, known))
+
+def _record_locator(directory, locator, note_path):
+    """
+    Add a newly created note to the locator index of its directory.
+    
+    Creating the note changed the directory mtime, the index checked just
+    before is carried over to the new mtime instead of rescanning.
+    """
+    cached = _locators_cache.get(directory)
+    if cached is None:
+        return
+    locators = cached[1]
+    locators[locator] = str(note_path)
+    _save_index(directory, directory.stat().st_mtime_ns, locators)
+
 def check_existing_note(locator, directory):
     """
     Check if a note with the given locator already exists.
@@ -213,14 +460,68 @@ def check_existing_note(locator, directory):
         tuple: (exists: bool, file_path: str or None) where file_path is the path
                to the existing note if it exists, None otherwise.
     """
-    for file_path in directory.glob("*.md"):
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if f"locator: {locator}" in content:
-                return True, str(file_path)
+    file_path = _known_locators(directory).get(locator)
+    if file_path:
+        return True, file_path
     return False, None
 
-def create_initial_note(url, note_type, tags=None):
+def _write_note(note_path, content):
+    """
+    Write a new note, creating its directory on first use.
+    
+    The note is created exclusively, an existing file (a note ID collision)
+    raises FileExistsError instead of being overwritten.
+    """
+    directory = note_path.parent
+    if directory not in _ready_dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+        _ready_dirs.add(directory)
+    data = memoryview(content.encode('utf-8'))
+    fd = os.open(note_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+# Tags that can be written as plain YAML scalars without changing meaning
+_PLAIN_TAG_RE = re.compile(r"[^\W\d][\w ./-]*(?<! )")
+_YAML_RESERVED_WORDS = {"yes", "no", "true", "false", "on", "off", "null"}
+
+def _yaml_escape(tag):
+    """Quote a tag if YAML would not read it back as the same plain string."""
+    tag = str(tag)
+    if _PLAIN_TAG_RE.fullmatch(tag) and tag.lower() not in _YAML_RESERVED_WORDS:
+        return tag
+    # JSON strings are valid double-quoted YAML scalars
+    return json.dumps(tag, ensure_ascii=False)
+
+def _format_tags_yaml(tags):
+    """Format tags as the YAML block list of the note frontmatter."""
+    if not tags:
+        return "tags: []"
+    return "tags:\n" + "\n".join(f"- {_yaml_escape(tag)}" for tag in tags)
+
+# Frontmatter of a new note for each note type
+_FMT = {
+    "youtube": "---\nid: {id}\nlocator: {locator}\nparsed: false\nscope: youtube\n{tags}\n---\n",
+    "github": "---\nid: {id}\nlocator: {locator}\nparsed: false\nscope: github\n{tags}\n---\n",
+    "reddit": "---\nid: {id}\nlocator: {locator}\nsubreddit: {subreddit}\nparsed: false\nscope: reddit\n{tags}\n---\n",
+    "steam": "---\nid: {id}\nlocator: {locator}\nparsed: false\nscope: steam\n{tags}\n---\n",
+    "hackernews": "---\nid: {id}\nlocator: {locator}\nparsed: false\nscope: hackernews\n{tags}\n---\n",
+    "default": "---\nid: {id}\nurl: {url}\nparsed: false\nscope: default\n{tags}\n---\n",
+}
+
+# How duplicate warnings refer to the item of each note type
+_ITEM_LABELS = {
+    "youtube": "YouTube video",
+    "github": "GitHub repo",
+    "reddit": "Reddit thread",
+    "steam": "Steam game",
+    "hackernews": "Hacker News item",
+}
+
+def create_initial_note(url, note_type, tags=None, locator=None, extras=None):
     """
     Create an initial markdown note based on URL type.
     
@@ -228,6 +529,9 @@ def create_initial_note(url, note_type, tags=None):
         url (str): URL to process
         note_type (str): Type of note to create
         tags (List[str], optional): List of tags to add to the note
+        locator (str, optional): Locator already extracted by classify_and_extract,
+            extracted from the URL if not provided
+        extras (dict, optional): Additional frontmatter fields extracted with it
     
     Returns:
         str: Path to the created note, or path to existing note if duplicate found
@@ -238,150 +542,59 @@ def create_initial_note(url, note_type, tags=None):
     if tags is None:
         tags = ["inbox"]
     
-    # Format tags as YAML list
-    tags_yaml = yaml.dump({"tags": tags}, default_flow_style=False).strip()
-    tags_yaml = tags_yaml.replace("tags:", "tags:")
+    if note_type in _SCOPE_DIRS and locator is None:
+        note_type, locator, extras = classify_and_extract(url)
     
-    if note_type == "youtube":
-        video_id = get_youtube_video_id(url)
-        
-        # Check if a note with this video ID already exists
-        exists, existing_file = check_existing_note(video_id, YOUTUBE_DIR)
-        if exists:
-            print(f"Note for YouTube video {video_id} already exists at: {existing_file}", file=sys.stderr)
-            return existing_file
-        
-        # Create initial note
-        note_path = YOUTUBE_DIR / f"{note_id}.md"
-        content = f"""---
-id: {note_id}
-locator: {video_id}
-parsed: false
-scope: youtube
-{tags_yaml}
----
-"""
-        with open(note_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return note_path
+    fields = {"id": note_id, "url": url, "tags": _format_tags_yaml(tags)}
     
-    elif note_type == "github":
-        repo_info = get_github_repo_info(url)
-        repo_id = f"{repo_info['owner']}/{repo_info['repo']}"
-        
-        # Check if a note with this repo ID already exists
-        exists, existing_file = check_existing_note(repo_id, GITHUB_DIR)
+    directory = _SCOPE_DIRS.get(note_type)
+    if directory:
+        # Check if a note with this locator already exists
+        exists, existing_file = check_existing_note(locator, directory)
         if exists:
-            print(f"Note for GitHub repo {repo_id} already exists at: {existing_file}", file=sys.stderr)
+            print(f"Note for {_ITEM_LABELS[note_type]} {locator} already exists at: {existing_file}", file=sys.stderr)
             return existing_file
         
-        # Create initial note
-        note_path = GITHUB_DIR / f"{note_id}.md"
-        content = f"""---
-id: {note_id}
-locator: {repo_id}
-parsed: false
-scope: github
-{tags_yaml}
----
-"""
-        with open(note_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return note_path
+        fields["locator"] = locator
+        fields.update(extras or {})
+    else:
+        directory = DEFAULT_DIR
+        note_type = "default"
     
-    elif note_type == "reddit":
-        thread_info = get_reddit_thread_info(url)
-        thread_id = thread_info['thread_id']
-        subreddit = thread_info['subreddit']
-        
-        # Check if a note with this thread ID already exists
-        exists, existing_file = check_existing_note(thread_id, REDDIT_DIR)
-        if exists:
-            print(f"Note for Reddit thread {thread_id} already exists at: {existing_file}", file=sys.stderr)
-            return existing_file
-        
-        # Create initial note
-        note_path = REDDIT_DIR / f"{note_id}.md"
-        content = f"""---
-id: {note_id}
-locator: {thread_id}
-subreddit: {subreddit}
-parsed: false
-scope: reddit
-{tags_yaml}
----
-"""
-        with open(note_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return note_path
+    # Create initial note
+    note_path = directory / f"{note_id}.md"
+    _write_note(note_path, _FMT[note_type].format_map(fields))
+    if note_type in _SCOPE_DIRS:
+        _record_locator(directory, locator, note_path)
     
-    elif note_type == "steam":
-        game_info = get_steam_game_info(url)
-        app_id = game_info['app_id']
-        
-        # Check if a note with this app ID already exists
-        exists, existing_file = check_existing_note(app_id, STEAM_DIR)
-        if exists:
-            print(f"Note for Steam game {app_id} already exists at: {existing_file}", file=sys.stderr)
-            return existing_file
-        
-        # Create initial note
-        note_path = STEAM_DIR / f"{note_id}.md"
-        content = f"""---
-id: {note_id}
-locator: {app_id}
-parsed: false
-scope: steam
-{tags_yaml}
----
-"""
-        with open(note_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return note_path
+    return note_path
+
+def _is_valid_url(url):
+    """Check that a URL has both a scheme and a host."""
+    try:
+        result = _split(url)
+    except ValueError:
+        # urlsplit only raises for malformed hosts such as an unclosed "[" IPv6
+        return False
+    return bool(result.scheme and result.netloc)
+
+def _paste_clipboard():
+    """
+    Get the clipboard content, pyperclip is only imported when it's needed.
     
-    elif note_type == "hackernews":
-        item_info = get_hackernews_item_info(url)
-        item_id = item_info['item_id']
-        
-        # Check if a note with this item ID already exists
-        exists, existing_file = check_existing_note(item_id, HN_DIR)
-        if exists:
-            print(f"Note for Hacker News item {item_id} already exists at: {existing_file}", file=sys.stderr)
-            return existing_file
-        
-        # Create initial note
-        note_path = HN_DIR / f"{note_id}.md"
-        content = f"""---
-id: {note_id}
-locator: {item_id}
-parsed: false
-scope: hackernews
-{tags_yaml}
----
-"""
-        with open(note_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return note_path
-    
-    else:  # default
-        note_path = DEFAULT_DIR / f"{note_id}.md"
-        content = f"""---
-id: {note_id}
-url: {url}
-parsed: false
-scope: default
-{tags_yaml}
----
-"""
-        with open(note_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return note_path
+    Returns:
+        str or None: None (after reporting why) if the clipboard can't be read
+    """
+    try:
+        import pyperclip
+    except ImportError:
+        print("pyperclip is not installed, can't read the clipboard.", file=sys.stderr)
+        return None
+    try:
+        return pyperclip.paste()
+    except pyperclip.PyperclipException:
+        print("Failed to get URL from clipboard.", file=sys.stderr)
+        return None
 
 def process_url(url, tags=None):
     """
@@ -397,30 +610,25 @@ def process_url(url, tags=None):
              or None if failed
     """
     if not url:
-        try:
-            url = pyperclip.paste()
-            print(f"Using URL from clipboard: {url}", file=sys.stderr)
-        except:
-            print("Failed to get URL from clipboard.", file=sys.stderr)
+        url = _paste_clipboard()
+        if url is None:
             return
+        print(f"Using URL from clipboard: {url}", file=sys.stderr)
         
         if not url:
             print("No URL provided and clipboard is empty.", file=sys.stderr)
             return
     
     # Validate URL
-    try:
-        result = urlparse(url)
-        if not all([result.scheme, result.netloc]):
-            print(f"Invalid URL: {url}", file=sys.stderr)
-            return
-    except:
+    if not _is_valid_url(url):
         print(f"Invalid URL: {url}", file=sys.stderr)
         return
     
-    # Check for Google search query
-    if is_google_search(url):
-        print(f"Processing Google search query: {url}", file=sys.stderr)
+    note_type, locator, extras = classify_and_extract(url)
+    print(f"Processing {_URL_LABELS[note_type]}: {url}", file=sys.stderr)
+    
+    # Google search queries are captured directly instead of as a note
+    if note_type == "google":
         from capturemd.capture_google import capture_google_search
         success = capture_google_search(url)
         if success:
@@ -429,40 +637,65 @@ def process_url(url, tags=None):
             return "google_search_processed"
         return None
     
-    # Determine URL type and create note
-    if is_youtube_video(url):
-        print(f"Processing YouTube video: {url}", file=sys.stderr)
-        note_path = create_initial_note(url, "youtube", tags)
-    elif is_github_repo(url):
-        print(f"Processing GitHub repository: {url}", file=sys.stderr)
-        note_path = create_initial_note(url, "github", tags)
-    elif is_reddit_thread(url):
-        print(f"Processing Reddit thread: {url}", file=sys.stderr)
-        note_path = create_initial_note(url, "reddit", tags)
-    elif is_steam_game(url):
-        print(f"Processing Steam game: {url}", file=sys.stderr)
-        note_path = create_initial_note(url, "steam", tags)
-    elif is_hackernews_item(url):
-        print(f"Processing Hacker News item: {url}", file=sys.stderr)
-        note_path = create_initial_note(url, "hackernews", tags)
-    else:
-        print(f"Processing generic URL: {url}", file=sys.stderr)
-        note_path = create_initial_note(url, "default", tags)
+    note_path = create_initial_note(url, note_type, tags, locator, extras)
     
     if note_path:
         print(f"Note created at: {note_path}", file=sys.stderr)
         return str(note_path)  # Convert Path to str for consistency
     return None
 
+def process_urls(urls, tags=None, workers=None):
+    """
+    Process a batch of URLs in parallel worker processes.
+    
+    URLs pointing at the same item (same scope and locator) are only processed
+    once so concurrent workers can't create duplicate notes for it.
+    
+    Args:
+        urls (List[str]): URLs to process
+        tags (List[str], optional): List of tags to add to the notes
+        workers (int, optional): Number of worker processes, defaults to the CPU count
+        
+    Returns:
+        List: process_url's result for each URL, in order
+    """
+    unique_urls = []
+    first_of = {}
+    url_slots = []
+    touched_dirs = set()
+    for url in urls:
+        key = url
+        if url and _is_valid_url(url):
+            note_type, locator, _ = classify_and_extract(url)
+            if note_type in _SCOPE_DIRS:
+                key = (note_type, locator)
+                touched_dirs.add(_SCOPE_DIRS[note_type])
+        if key not in first_of or key == url:
+            first_of[key] = len(unique_urls)
+            unique_urls.append(url)
+        url_slots.append(first_of[key])
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = list(
+            executor.map(partial(process_url, tags=tags), unique_urls, chunksize=16)
+        )
+    
+    # Workers each carried their own copy of the indexes forward, rebuild the
+    # ones they wrote to from the final directory state
+    for directory in touched_dirs:
+        _rebuild_index(directory)
+    
+    return [results[slot] for slot in url_slots]
+
 def main():
     # Get URL from arguments or clipboard
     if len(sys.argv) > 1:
         url = sys.argv[1]
     else:
-        try:
-            url = pyperclip.paste()
-        except:
-            print("Failed to get URL from clipboard.", file=sys.stderr)
+        url = _paste_clipboard()
+        if url is None:
             return
     
     note_path = process_url(url)
@@ -480,9 +713,15 @@ def parse_unparsed_notes():
     print("Parsing unparsed notes...", file=sys.stderr)
     # This will be implemented in second script
     # For now, we'll just call it as a subprocess
+    import subprocess
+    
     parser_script = Path(__file__).parent / "parse_notes.py"
     if parser_script.exists():
-        subprocess.run([sys.executable, str(parser_script)])
+        # Run as a module, parse_notes uses package relative imports
+        subprocess.run(
+            [sys.executable, "-m", "capturemd.parse_notes"],
+            cwd=parser_script.parent.parent,
+        )
     else:
         print(f"Parser script not found: {parser_script}", file=sys.stderr)
 
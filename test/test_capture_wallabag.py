@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# test_capture_wallabag.py - Test the Wallabag since window
+
+import unittest
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+import sys
+import os
+import tempfile
+
+import requests
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import capturemd.capture_wallabag as capture_wallabag
+from capturemd.capture_wallabag import (
+    load_wallabag_since,
+    save_wallabag_since,
+    get_entry_timestamp,
+    process_wallabag,
+)
+from capturemd.paths import CACHE_DIR
+
+# Captured before any test patches it
+DEFAULT_SINCE_FILE = capture_wallabag.WALLABAG_SINCE_FILE
+
+ENTRIES = [
+    {"id": 1, "url": "https://example.com/a", "updated_at": "2024-03-15T10:00:00+0000"},
+    {"id": 2, "url": "https://example.com/b", "updated_at": "2024-03-16T10:00:00+0000"},
+]
+
+class TestWallabagSince(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.since_file = Path(self.tmp.name) / "cache" / "wallabag_since"
+
+        patchers = [
+            patch.object(capture_wallabag, "WALLABAG_SINCE_FILE", self.since_file),
+            patch("sys.stdout"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_since_file_in_cache_dir(self):
+        self.assertEqual(DEFAULT_SINCE_FILE.parent, CACHE_DIR)
+
+    def test_since_round_trip(self):
+        self.assertIsNone(load_wallabag_since())
+
+        save_wallabag_since(1710496800)
+
+        self.assertTrue(self.since_file.exists())
+        self.assertEqual(load_wallabag_since(), 1710496800)
+
+    def test_invalid_since_file(self):
+        self.since_file.parent.mkdir(parents=True)
+        self.since_file.write_text("not a timestamp", encoding="utf-8")
+
+        self.assertIsNone(load_wallabag_since())
+
+    def test_get_entry_timestamp(self):
+        self.assertEqual(get_entry_timestamp(ENTRIES[0]), 1710496800)
+        self.assertEqual(
+            get_entry_timestamp({"updated_at": "2024-03-15T11:00:00+0100"}), 1710496800
+        )
+        self.assertIsNone(get_entry_timestamp({}))
+        self.assertIsNone(get_entry_timestamp({"updated_at": "yesterday"}))
+
+    def run_process_wallabag(self, entry_results):
+        wallabag = MagicMock()
+        wallabag.authenticate.return_value = True
+        wallabag.get_entries_without_tag.return_value = (ENTRIES, True)
+
+        with patch.object(capture_wallabag, "WallabagAPI", return_value=wallabag), \
+                patch.object(capture_wallabag, "process_wallabag_entry",
+                             side_effect=entry_results), \
+                patch.object(capture_wallabag, "process_existing_bookmark_notes"):
+            self.assertEqual(process_wallabag(), 0)
+        return wallabag
+
+    def test_window_advances_when_all_processed(self):
+        save_wallabag_since(1700000000)
+
+        wallabag = self.run_process_wallabag([True, True])
+
+        wallabag.get_entries_without_tag.assert_called_once_with(
+            capture_wallabag.WALLABAG_PARSED_TAG, since=1700000000
+        )
+        self.assertEqual(load_wallabag_since(), get_entry_timestamp(ENTRIES[1]))
+
+    def test_window_kept_when_entry_fails(self):
+        save_wallabag_since(1700000000)
+
+        self.run_process_wallabag([True, False])
+
+        self.assertEqual(load_wallabag_since(), 1700000000)
+
+    def test_window_kept_when_page_fails(self):
+        first_page = MagicMock()
+        first_page.json.return_value = {
+            "_embedded": {"items": ENTRIES},
+            "_links": {"next": {"href": "page=2"}},
+        }
+
+        def fake_get(url, params=None, headers=None):
+            if params["page"] == 1:
+                return first_page
+            raise requests.exceptions.RequestException("connection reset")
+
+        with patch.object(capture_wallabag.WallabagAPI, "authenticate", return_value=True), \
+                patch.object(capture_wallabag.WallabagAPI, "get_headers", return_value={}), \
+                patch("requests.get", side_effect=fake_get), \
+                patch.object(capture_wallabag, "process_wallabag_entry",
+                             return_value=True) as process_entry, \
+                patch.object(capture_wallabag, "process_existing_bookmark_notes"):
+            self.assertEqual(process_wallabag(), 0)
+
+        # Entries of the fetched page are still processed
+        self.assertEqual(process_entry.call_count, len(ENTRIES))
+        self.assertFalse(self.since_file.exists())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# test_episode_indexer.py - Test the episode indexer
+
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+import sys
+import os
+import io
+import tempfile
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from capturemd.episode_indexer import reindex_season_episodes
+
+NFO_TEMPLATE = """<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>
+<episodedetails>
+    <title>{title}</title>
+    <season>2024</season>
+    <aired>{aired}</aired>
+</episodedetails>
+"""
+
+class TestEpisodeIndexer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+        self.season_dir = self.cache_dir / "channel" / "Season 2024"
+        self.season_dir.mkdir(parents=True)
+        self.write_nfo("a", "2024-01-01")
+        self.write_nfo("b", "2024-02-01")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_nfo(self, video_id, aired):
+        nfo_path = self.season_dir / f"{video_id}.nfo"
+        with open(nfo_path, "w", encoding="utf-8") as f:
+            f.write(NFO_TEMPLATE.format(title=video_id, aired=aired))
+        return nfo_path
+
+    def read_nfo(self, video_id):
+        with open(self.season_dir / f"{video_id}.nfo", "r", encoding="utf-8") as f:
+            return f.read()
+
+    def reindex(self):
+        with patch('sys.stdout', new=io.StringIO()):
+            reindex_season_episodes(self.cache_dir)
+
+    def test_reindex_assigns_episodes_by_aired_date(self):
+        self.reindex()
+
+        self.assertIn("<episode>1</episode>", self.read_nfo("a"))
+        self.assertIn("<episode>2</episode>", self.read_nfo("b"))
+
+    def test_reindex_after_nfo_rewritten_in_place(self):
+        self.reindex()
+        season_mtime = self.season_dir.stat().st_mtime_ns
+
+        # Rewrite an NFO in place, as cache_manager does when regenerating it,
+        # which drops the episode number without touching the directory mtime
+        nfo_path = self.write_nfo("a", "2024-01-01")
+        stat = nfo_path.stat()
+        os.utime(nfo_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        os.utime(self.season_dir, ns=(season_mtime, season_mtime))
+        self.assertNotIn("<episode>", self.read_nfo("a"))
+
+        self.reindex()
+
+        self.assertIn("<episode>1</episode>", self.read_nfo("a"))
+        self.assertIn("<episode>2</episode>", self.read_nfo("b"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# test_parse_notes.py - Test parsing unparsed notes
+
+import unittest
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+import sys
+import os
+import io
+import time
+import tempfile
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import capturemd.paths
+import capturemd.parse_notes as parse_notes_module
+from capturemd.parse_notes import parse_notes
+
+REPO_INFO = {
+    "name": "repo",
+    "owner": {"login": "owner", "avatar_url": ""},
+    "created_at": "2024-01-01T00:00:00",
+}
+
+def fake_get(url):
+    response = MagicMock()
+    if url.endswith("/languages"):
+        response.json.return_value = {"Zig": 100}
+    else:
+        response.json.return_value = REPO_INFO
+    return response
+
+class TestParseNotes(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp_path = Path(self.tmp.name)
+        self.notes_dir = tmp_path / "resource"
+        self.topic_dir = tmp_path / "topic" / "lang"
+        (self.notes_dir / "github").mkdir(parents=True)
+        self.topic_dir.mkdir(parents=True)
+
+        patchers = [
+            patch.object(parse_notes_module, "MARKDOWN_DIR", self.notes_dir),
+            patch.object(capturemd.paths, "TOPIC_LANG_DIR", self.topic_dir),
+            patch.dict(parse_notes_module._parser_modules, clear=True),
+            patch("requests.get", side_effect=fake_get),
+            patch("sys.stdout", new=io.StringIO()),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_note(self, name, locator):
+        note_path = self.notes_dir / "github" / name
+        with open(note_path, "w", encoding="utf-8") as f:
+            f.write(
+                f"---\nid: {name}\nlocator: {locator}\nparsed: false\n"
+                f"scope: github\ntags:\n- inbox\n---\n"
+            )
+        return note_path
+
+    def test_github_notes_sharing_new_language(self):
+        self.write_note("a.md", "owner/repo-a")
+        self.write_note("b.md", "owner/repo-b")
+
+        parser_module = parse_notes_module.load_parser_module("github")
+        read_markdown_files = parser_module.read_markdown_files
+
+        def slow_read_markdown_files():
+            # Widen the gap between looking up and creating a topic note
+            results = read_markdown_files()
+            time.sleep(0.05)
+            return results
+
+        with patch.object(parser_module, "read_markdown_files", slow_read_markdown_files):
+            parse_notes()
+
+        topic_notes = list(self.topic_dir.glob("*.md"))
+        self.assertEqual(len(topic_notes), 1)
+        topic_id = topic_notes[0].stem
+        for name in ("a.md", "b.md"):
+            with open(self.notes_dir / "github" / name, "r", encoding="utf-8") as f:
+                content = f.read()
+            self.assertIn("parsed: true", content)
+            self.assertIn(f"[[{topic_id}|Zig]]", content)
+
+if __name__ == '__main__':
+    unittest.main()
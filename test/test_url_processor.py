@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# test_url_processor.py - Test URL classification and duplicate detection
+
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+import sys
+import os
+import tempfile
+
+# Add the parent directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import capturemd.url_processor as url_processor
+from capturemd.url_processor import (
+    classify_and_extract,
+    check_existing_note,
+    create_initial_note,
+)
+
+class TestClassifyAndExtract(unittest.TestCase):
+
+    def test_youtube(self):
+        for url in (
+            "https://www.youtube.com/watch?v=abc123&t=5",
+            "https://youtu.be/abc123?si=x",
+            "https://m.youtube.com/watch?v=abc123",
+            "https://www.youtube.com/redirect?url=https%3A%2F%2Fyoutu.be%2Fabc123",
+        ):
+            self.assertEqual(classify_and_extract(url), ("youtube", "abc123", {}), url)
+
+    def test_youtube_shorts(self):
+        self.assertEqual(
+            classify_and_extract("https://www.youtube.com/shorts/xyz789"),
+            ("youtube", "xyz789", {}),
+        )
+
+    def test_github(self):
+        self.assertEqual(
+            classify_and_extract("https://github.com/owner/repo/tree/main"),
+            ("github", "owner/repo", {}),
+        )
+
+    def test_reddit(self):
+        self.assertEqual(
+            classify_and_extract("https://www.reddit.com/r/python/comments/t1abc/title/"),
+            ("reddit", "t1abc", {"subreddit": "python"}),
+        )
+
+    def test_steam(self):
+        self.assertEqual(
+            classify_and_extract("https://store.steampowered.com/app/620/Portal_2/"),
+            ("steam", "620", {}),
+        )
+
+    def test_hackernews(self):
+        self.assertEqual(
+            classify_and_extract("https://news.ycombinator.com/item?id=123"),
+            ("hackernews", "123", {}),
+        )
+
+    def test_google(self):
+        self.assertEqual(
+            classify_and_extract("https://www.google.com/search?q=x"),
+            ("google", None, {}),
+        )
+
+    def test_default(self):
+        for url in (
+            "https://example.com/a",
+            "https://youtube.com/watch?v=",
+            "https://github.com/owner",
+            "https://news.ycombinator.com/news",
+        ):
+            self.assertEqual(classify_and_extract(url), ("default", None, {}), url)
+
+class TestLocatorIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp_path = Path(self.tmp.name)
+        self.notes_dir = tmp_path / "youtube"
+        self.notes_dir.mkdir()
+
+        patchers = [
+            patch.object(url_processor, "LOCATOR_INDEX_DIR", tmp_path / "locators"),
+            patch.dict(url_processor._SCOPE_DIRS, {"youtube": self.notes_dir}),
+            patch.dict(url_processor._locators_cache, clear=True),
+            patch("sys.stderr"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_note(self, name, content):
+        note_path = self.notes_dir / name
+        with open(note_path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        self.touch_notes_dir()
+        return note_path
+
+    def touch_notes_dir(self):
+        # Make sure the index sees the change even on coarse mtime filesystems
+        stat = self.notes_dir.stat()
+        os.utime(self.notes_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_duplicate_found_after_note_added(self):
+        self.assertEqual(check_existing_note("abc123", self.notes_dir), (False, None))
+
+        note_path = create_initial_note("https://youtu.be/abc123", "youtube")
+
+        self.assertEqual(
+            check_existing_note("abc123", self.notes_dir), (True, str(note_path))
+        )
+        duplicate = create_initial_note("https://www.youtube.com/watch?v=abc123", "youtube")
+        self.assertEqual(duplicate, str(note_path))
+        self.assertEqual(len(list(self.notes_dir.glob("*.md"))), 1)
+
+    def test_duplicate_found_via_stored_index(self):
+        note_path = self.write_note("a.md", "---\nid: a\nlocator: abc123\n---\n")
+        check_existing_note("abc123", self.notes_dir)
+
+        # A new process starts with an empty in-memory cache
+        url_processor._locators_cache.clear()
+        with patch.object(url_processor, "_read_locator") as read_locator:
+            result = check_existing_note("abc123", self.notes_dir)
+
+        self.assertEqual(result, (True, str(note_path)))
+        read_locator.assert_not_called()
+
+    def test_note_added_by_another_process(self):
+        check_existing_note("abc123", self.notes_dir)
+
+        note_path = self.write_note("a.md", "---\nid: a\nlocator: abc123\n---\n")
+
+        self.assertEqual(
+            check_existing_note("abc123", self.notes_dir), (True, str(note_path))
+        )
+
+    def test_note_removed(self):
+        note_path = self.write_note("a.md", "---\nid: a\nlocator: abc123\n---\n")
+        self.assertEqual(
+            check_existing_note("abc123", self.notes_dir), (True, str(note_path))
+        )
+
+        note_path.unlink()
+        self.touch_notes_dir()
+
+        self.assertEqual(check_existing_note("abc123", self.notes_dir), (False, None))
+
+    def test_quoted_locators(self):
+        self.write_note("a.md", "---\nid: a\nlocator: 'abc123'\n---\n")
+        self.write_note("b.md", '---\nid: b\nlocator: "def456"\n---\n')
+
+        self.assertTrue(check_existing_note("abc123", self.notes_dir)[0])
+        self.assertTrue(check_existing_note("def456", self.notes_dir)[0])
+
+    def test_crlf_and_trailing_whitespace_delimiters(self):
+        self.write_note("a.md", "---\r\nid: a\r\nlocator: abc123\r\n---\r\nbody\r\n")
+        self.write_note("b.md", "--- \nid: b\nlocator: def456\n---  \n")
+
+        self.assertTrue(check_existing_note("abc123", self.notes_dir)[0])
+        self.assertTrue(check_existing_note("def456", self.notes_dir)[0])
+
+    def test_locator_in_note_body_ignored(self):
+        self.write_note("a.md", "---\nid: a\nlocator: abc123\n---\nlocator: def456\n")
+        self.write_note("b.md", "# No frontmatter\nlocator: ghi789\n")
+
+        self.assertTrue(check_existing_note("abc123", self.notes_dir)[0])
+        self.assertEqual(check_existing_note("def456", self.notes_dir), (False, None))
+        self.assertEqual(check_existing_note("ghi789", self.notes_dir), (False, None))
+
+if __name__ == '__main__':
+    unittest.main()